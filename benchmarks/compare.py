@@ -0,0 +1,52 @@
+"""Compare two benchmark result files.
+
+Usage: python -m benchmarks.compare BASELINE.json CANDIDATE.json [--threshold PCT]
+
+Exits with status 1 when any p95 latency regresses by more than the
+threshold (default 10%).
+"""
+
+import argparse
+import json
+import sys
+
+METRICS = ("throughput_rps", "p50_ms", "p95_ms", "p99_ms")
+
+
+def change(before: float, after: float) -> float:
+    return (after - before) / before * 100 if before else 0.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0)
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    print(f"{baseline['revision']} -> {candidate['revision']}")
+    print(f"{'benchmark':<28}" + "".join(f"{metric:>18}" for metric in METRICS))
+    regressions = []
+    for name, after in candidate["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        cells = "".join(
+            f"{change(before[metric], after[metric]):>+17.1f}%" for metric in METRICS
+        )
+        print(f"{name:<28}{cells}")
+        if change(before["p95_ms"], after["p95_ms"]) > args.threshold:
+            regressions.append(name)
+
+    if regressions:
+        print(f"p95 regressions over {args.threshold}%: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
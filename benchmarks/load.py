@@ -0,0 +1,217 @@
+"""Load test for the auth and user endpoints.
+
+Drives the app in-process (default), against a running server (--url) or
+against granian workers started by the script (--granian). A reachable
+database with migrations applied is required in every mode.
+
+The login throttle is disabled for the in-process and granian modes; a server
+under --url must run with LOGIN_THROTTLE_IP_LIMIT=0 and
+LOGIN_THROTTLE_EMAIL_LIMIT=0, otherwise the run aborts on the first 429.
+
+Usage: python -m benchmarks.load [--requests N] [--concurrency C] [--output FILE]
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable
+
+import httpx
+
+from benchmarks.common import print_table, save_results, summarize
+
+PASSWORD = "benchmark-password"
+
+
+class VirtualUser:
+    def __init__(self, email: str):
+        self.email = email
+        self.user_id: int | None = None
+        self.access_token: str | None = None
+        self.refresh_token: str | None = None
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.access_token}"}
+
+
+async def run_scenario(
+    users: list[VirtualUser],
+    requests_per_user: int,
+    call: Callable[[VirtualUser], Awaitable[httpx.Response]],
+) -> dict[str, float]:
+    latencies: list[float] = []
+    errors = 0
+
+    async def worker(user: VirtualUser) -> None:
+        nonlocal errors
+        for _ in range(requests_per_user):
+            started = time.perf_counter()
+            response = await call(user)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(user) for user in users))
+    stats = summarize(latencies, time.perf_counter() - started)
+    stats["errors"] = errors
+    return stats
+
+
+async def run_suite(
+    client: httpx.AsyncClient, concurrency: int, requests: int
+) -> dict[str, dict[str, float]]:
+    run_id = uuid.uuid4().hex[:8]
+    users = [
+        VirtualUser(f"bench-{run_id}-{index}@example.com")
+        for index in range(concurrency)
+    ]
+    per_user = max(1, requests // concurrency)
+    register_counter = iter(range(10**9))
+
+    async def register(user: VirtualUser) -> httpx.Response:
+        email = f"bench-{run_id}-r{next(register_counter)}@example.com"
+        return await client.post(
+            "/auth/register", json={"email": email, "password": PASSWORD}
+        )
+
+    async def login(user: VirtualUser) -> httpx.Response:
+        response = await client.post(
+            "/auth/login", json={"email": user.email, "password": PASSWORD}
+        )
+        if response.status_code == 429:
+            raise RuntimeError("Login was throttled; disable LOGIN_THROTTLE_* limits")
+        if response.status_code < 400:
+            body = response.json()
+            user.user_id = body["user_id"]
+            user.access_token = body["access_token"]
+            user.refresh_token = body["refresh_token"]
+        return response
+
+    async def refresh(user: VirtualUser) -> httpx.Response:
+        response = await client.post(
+            "/auth/refresh", json={"refresh_token": user.refresh_token}
+        )
+        if response.status_code < 400:
+            user.refresh_token = response.json()["refresh_token"]
+        return response
+
+    async def get_user(user: VirtualUser) -> httpx.Response:
+        return await client.get(f"/users/{user.user_id}", headers=user.headers)
+
+    async def list_users(user: VirtualUser) -> httpx.Response:
+        return await client.get("/users/", headers=user.headers)
+
+    for user in users:
+        response = await client.post(
+            "/auth/register", json={"email": user.email, "password": PASSWORD}
+        )
+        response.raise_for_status()
+        body = response.json()
+        user.user_id = body["user_id"]
+        user.access_token = body["access_token"]
+        user.refresh_token = body["refresh_token"]
+
+    # Hashing dominates register/login, so they get fewer requests.
+    hash_bound = max(1, per_user // 10)
+    return {
+        "POST /auth/register": await run_scenario(users, hash_bound, register),
+        "POST /auth/login": await run_scenario(users, hash_bound, login),
+        "POST /auth/refresh": await run_scenario(users, per_user, refresh),
+        "GET /users/{id}": await run_scenario(users, per_user, get_user),
+        "GET /users/": await run_scenario(users, per_user, list_users),
+    }
+
+
+@asynccontextmanager
+async def in_process_client() -> AsyncIterator[httpx.AsyncClient]:
+    from litestar.testing import AsyncTestClient
+
+    from src.main import app
+
+    async with AsyncTestClient(app=app) as client:
+        yield client
+
+
+@asynccontextmanager
+async def remote_client(url: str) -> AsyncIterator[httpx.AsyncClient]:
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        yield client
+
+
+@asynccontextmanager
+async def granian_client(workers: int, port: int) -> AsyncIterator[httpx.AsyncClient]:
+    process = subprocess.Popen(
+        [
+            "granian",
+            "--interface",
+            "asgi",
+            "--loop",
+            "asyncio",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "src.main:app",
+        ]
+    )
+    try:
+        async with remote_client(f"http://127.0.0.1:{port}") as client:
+            deadline = time.monotonic() + 30
+            while True:
+                try:
+                    if (await client.get("/health")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if time.monotonic() > deadline:
+                    raise RuntimeError("granian did not become ready in 30s")
+                await asyncio.sleep(0.2)
+            yield client
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+async def _main(args: argparse.Namespace) -> dict[str, dict[str, float]]:
+    if args.url:
+        client_cm = remote_client(args.url)
+    elif args.granian:
+        client_cm = granian_client(args.workers, args.port)
+    else:
+        client_cm = in_process_client()
+    async with client_cm as client:
+        return await run_suite(client, args.concurrency, args.requests)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--url", default=None, help="Benchmark a running server")
+    parser.add_argument("--granian", action="store_true", help="Spawn granian")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    # Every virtual user logs in from one address; the throttle would turn
+    # the login scenario into a 429 benchmark.
+    os.environ.setdefault("LOGIN_THROTTLE_IP_LIMIT", "0")
+    os.environ.setdefault("LOGIN_THROTTLE_EMAIL_LIMIT", "0")
+    results = asyncio.run(_main(args))
+    mode = "remote" if args.url else "granian" if args.granian else "inprocess"
+    print_table(results)
+    print(f"saved to {save_results(f'load-{mode}', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
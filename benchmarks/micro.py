@@ -0,0 +1,66 @@
+"""Micro-benchmarks for password hashing and token handling.
+
+Usage: python -m benchmarks.micro [--iterations N] [--output FILE]
+"""
+
+import argparse
+import time
+from typing import Callable
+
+from benchmarks.common import print_table, save_results, summarize
+
+
+def measure(func: Callable[[], object], iterations: int) -> dict[str, float]:
+    func()
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        call_started = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - call_started)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--hash-iterations", type=int, default=20)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    from src.account.services import UserService
+    from src.auth.services import TokenService
+    from src.auth.token_cache import token_cache
+    from src.utils.password import hash_password, verify_password
+
+    token_service = TokenService(UserService(session=None))
+    stored_hash = hash_password("benchmark-password")
+    access_token = token_service.create_access_token(1, "bench@example.com")
+
+    results = {
+        "hash_password": measure(
+            lambda: hash_password("benchmark-password"), args.hash_iterations
+        ),
+        "verify_password": measure(
+            lambda: verify_password("benchmark-password", stored_hash),
+            args.hash_iterations,
+        ),
+        "create_access_token": measure(
+            lambda: token_service.create_access_token(1, "bench@example.com"),
+            args.iterations,
+        ),
+        # Full JWT decode and signature check, comparable across revisions.
+        "verify_token": measure(
+            lambda: (token_cache.clear(), token_service.verify_token(access_token)),
+            args.iterations,
+        ),
+        "verify_token_cached": measure(
+            lambda: token_service.verify_token(access_token), args.iterations
+        ),
+    }
+    print_table(results)
+    print(f"saved to {save_results('micro', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
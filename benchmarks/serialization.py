@@ -0,0 +1,86 @@
+"""Micro-benchmark for user response serialization.
+
+Compares the old path (ORM entity -> Pydantic model -> JSON) with the
+column-projected path (row tuple -> msgspec struct -> JSON) on synthetic
+data, and checks that both produce identical bytes. No database needed.
+
+Usage: python -m benchmarks.serialization [--rows N] [--iterations N] [--output FILE]
+"""
+
+import argparse
+from datetime import datetime, timezone
+
+from benchmarks.common import print_table, save_results
+from benchmarks.micro import measure
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    from litestar.plugins.pydantic import PydanticInitPlugin
+    from litestar.serialization import encode_json, get_serializer
+
+    from src.account.models.users import User
+    from src.account.schemas import (
+        UserListRecord,
+        UserListResponse,
+        UserRecord,
+        UserResponse,
+    )
+
+    now = datetime.now(timezone.utc)
+    rows = [
+        (index, f"user{index}@example.com", f"user{index}", now, now)
+        for index in range(1, args.rows + 1)
+    ]
+    entities = [
+        User(
+            id=id,
+            email=email,
+            username=username,
+            password_hash="x" * 64,
+            created_at=created_at,
+            updated_at=updated_at,
+        )
+        for id, email, username, created_at, updated_at in rows
+    ]
+    list_rows = [row[:3] for row in rows]
+    # The same type encoders the app registers for Pydantic models.
+    pydantic_serializer = get_serializer(PydanticInitPlugin.encoders())
+
+    def list_pydantic() -> bytes:
+        return encode_json(
+            [UserListResponse.model_validate(entity) for entity in entities],
+            pydantic_serializer,
+        )
+
+    def list_struct() -> bytes:
+        return encode_json([UserListRecord(*row) for row in list_rows])
+
+    def get_pydantic() -> bytes:
+        return encode_json(
+            UserResponse.model_validate(entities[0]), pydantic_serializer
+        )
+
+    def get_struct() -> bytes:
+        return encode_json(UserRecord(*rows[0]))
+
+    if list_pydantic() != list_struct() or get_pydantic() != get_struct():
+        raise SystemExit("struct encoding differs from the Pydantic output")
+
+    results = {
+        f"list pydantic x{args.rows}": measure(list_pydantic, args.iterations),
+        f"list struct x{args.rows}": measure(list_struct, args.iterations),
+        "get pydantic": measure(get_pydantic, args.iterations * 10),
+        "get struct": measure(get_struct, args.iterations * 10),
+    }
+    print_table(results)
+    print(f"saved to {save_results('serialization', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
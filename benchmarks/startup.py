@@ -0,0 +1,141 @@
+"""Cold-start benchmark: import time and time to first request per worker.
+
+Every run starts a fresh interpreter, once with the OpenAPI schema generated
+at runtime and once with a prebuilt schema (OPENAPI_PREBUILT_PATH). By
+default the app is driven in-process through Litestar's test client; with
+--granian a single granian worker is spawned and polled over HTTP.
+
+Usage: python -m benchmarks.startup [--runs N] [--granian] [--output FILE]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.common import print_table, save_results, summarize
+
+IN_PROCESS = """
+import json, time
+started = time.perf_counter()
+from src.main import app
+imported = time.perf_counter()
+from litestar.testing import TestClient
+with TestClient(app) as client:
+    client.get("/health").raise_for_status()
+    health = time.perf_counter()
+    client.get("/schema/openapi.json").raise_for_status()
+    schema = time.perf_counter()
+print(json.dumps({
+    "import": imported - started,
+    "first /health": health - started,
+    "first /schema": schema - started,
+}))
+"""
+
+IMPORT_ONLY = """
+import json, time
+started = time.perf_counter()
+import src.main
+print(json.dumps({"import": time.perf_counter() - started}))
+"""
+
+
+def run_in_process(env: dict[str, str]) -> dict[str, float]:
+    output = subprocess.check_output(
+        [sys.executable, "-c", IN_PROCESS], env=env, stderr=subprocess.DEVNULL
+    )
+    return json.loads(output.splitlines()[-1])
+
+
+def wait_for(client: httpx.Client, path: str, deadline: float) -> None:
+    while True:
+        try:
+            if client.get(path).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"{path} did not answer within 60s")
+        time.sleep(0.01)
+
+
+def run_granian(env: dict[str, str], port: int) -> dict[str, float]:
+    import_time = json.loads(
+        subprocess.check_output([sys.executable, "-c", IMPORT_ONLY], env=env)
+    )["import"]
+    started = time.monotonic()
+    process = subprocess.Popen(
+        [
+            "granian",
+            "--interface",
+            "asgi",
+            "--loop",
+            "asyncio",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--workers",
+            "1",
+            "src.main:app",
+        ],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}") as client:
+            wait_for(client, "/health", started + 60)
+            health = time.monotonic() - started
+            wait_for(client, "/schema/openapi.json", started + 60)
+            schema = time.monotonic() - started
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+    return {"import": import_time, "first /health": health, "first /schema": schema}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--granian", action="store_true", help="Spawn granian")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        schema_path = os.path.join(directory, "openapi.json")
+        subprocess.check_call(
+            [sys.executable, "-m", "src.core.openapi", "build", "--output", schema_path],
+            stdout=subprocess.DEVNULL,
+        )
+        modes = {
+            "runtime": {**os.environ, "OPENAPI_PREBUILT_PATH": ""},
+            "prebuilt": {**os.environ, "OPENAPI_PREBUILT_PATH": schema_path},
+        }
+        samples: dict[str, list[float]] = {}
+        for _ in range(args.runs):
+            for mode, env in modes.items():
+                if args.granian:
+                    timings = run_granian(env, args.port)
+                else:
+                    timings = run_in_process(env)
+                for name, seconds in timings.items():
+                    samples.setdefault(f"{name} ({mode})", []).append(seconds)
+
+    results = {
+        name: summarize(values, sum(values)) for name, values in samples.items()
+    }
+    print_table(results)
+    mode = "granian" if args.granian else "inprocess"
+    print(f"saved to {save_results(f'startup-{mode}', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Local stand-in for an OAuth provider's token endpoint.
+
+Usage: python scripts/oauth_stub.py [--port 9100] [--expires-in 3600]
+       [--latency-ms 50] [--reject-rate 0.0] [--error-rate 0.0]
+
+Point the refresher at it with:
+    OAUTH_PROVIDERS=stub OAUTH_STUB_TOKEN_URL=http://127.0.0.1:9100/token
+"""
+
+import argparse
+import json
+import random
+import secrets
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+
+def make_handler(args: argparse.Namespace) -> type[BaseHTTPRequestHandler]:
+    class TokenHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _reply(self, status: int, body: dict) -> None:
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self) -> None:
+            length = int(self.headers.get("Content-Length", 0))
+            form = parse_qs(self.rfile.read(length).decode())
+            time.sleep(args.latency_ms / 1000)
+
+            if self.path != "/token":
+                self._reply(404, {"error": "not_found"})
+            elif form.get("grant_type") != ["refresh_token"] or not form.get(
+                "refresh_token"
+            ):
+                self._reply(400, {"error": "unsupported_grant_type"})
+            elif random.random() < args.reject_rate:
+                self._reply(400, {"error": "invalid_grant"})
+            elif random.random() < args.error_rate:
+                self._reply(503, {"error": "temporarily_unavailable"})
+            else:
+                self._reply(
+                    200,
+                    {
+                        "access_token": secrets.token_urlsafe(32),
+                        "refresh_token": secrets.token_urlsafe(32),
+                        "token_type": "bearer",
+                        "expires_in": args.expires_in,
+                    },
+                )
+
+        def log_message(self, format: str, *log_args) -> None:
+            if args.verbose:
+                super().log_message(format, *log_args)
+
+    return TokenHandler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--expires-in", type=int, default=3600)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--reject-rate", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args))
+    print(f"OAuth stub listening on http://{args.host}:{args.port}/token")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
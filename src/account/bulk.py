@@ -0,0 +1,239 @@
+"""Bulk user import from CSV or NDJSON.
+
+Usage: python -m src.account.bulk users.csv [--format csv|ndjson] > report.ndjson
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import sys
+from collections import deque
+from typing import Any, AsyncIterator, Literal
+
+from pydantic import ValidationError
+from sqlalchemy.dialects.postgresql import insert
+
+from src.account.models.users import User
+from src.account.schemas import UserCreate
+from src.core.config import config
+from src.core.database import engine
+from src.utils.password import hash_passwords_parallel, shutdown_password_executor
+
+ImportFormat = Literal["csv", "ndjson"]
+
+_insert_users = (
+    insert(User.__table__)
+    .on_conflict_do_nothing()
+    .returning(User.__table__.c.id, User.__table__.c.email)
+)
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8").rstrip("\r")
+    if buffer:
+        yield buffer.decode("utf-8").rstrip("\r")
+
+
+class _LineFeed:
+    """Line iterator that csv.reader drains as the async stream fills it.
+
+    Lines get their newline back so that quoted fields spanning lines keep it.
+    """
+
+    def __init__(self):
+        self.lines: deque[str] = deque()
+        self.quotes = 0
+
+    def __iter__(self) -> "_LineFeed":
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            raise StopIteration
+        return self.lines.popleft() + "\n"
+
+    def push(self, line: str) -> None:
+        self.lines.append(line)
+        self.quotes += line.count('"')
+
+    @property
+    def complete(self) -> bool:
+        # An odd number of quotes means a quoted field is still open.
+        return self.quotes % 2 == 0
+
+
+async def iter_records(
+    lines: AsyncIterator[str], import_format: ImportFormat
+) -> AsyncIterator[tuple[int, dict[str, Any] | None, str | None]]:
+    if import_format == "csv":
+        async for entry in _iter_csv_records(lines):
+            yield entry
+        return
+
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("Expected a JSON object")  # noqa: EM101
+        except ValueError as e:
+            yield line_number, None, str(e)
+            continue
+        yield line_number, record, None
+
+
+async def _iter_csv_records(
+    lines: AsyncIterator[str],
+) -> AsyncIterator[tuple[int, dict[str, Any] | None, str | None]]:
+    """Parse with one csv.reader so quoted newlines stay inside their field.
+
+    Records are numbered by the physical line they start on.
+    """
+    feed = _LineFeed()
+    reader = csv.reader(feed, strict=True)
+    header: list[str] | None = None
+    pending = True
+    while pending:
+        try:
+            line = await anext(lines)
+            feed.push(line)
+            if not feed.complete:
+                continue
+        except StopAsyncIteration:
+            pending = False
+        while feed.lines:
+            line_number = reader.line_num + 1
+            try:
+                fields = next(reader)
+            except csv.Error as e:
+                yield line_number, None, str(e)
+                continue
+            if not fields or not any(field.strip() for field in fields):
+                continue
+            if header is None:
+                header = [field.strip() for field in fields]
+                continue
+            yield line_number, dict(zip(header, fields)), None
+        feed.quotes = 0
+
+
+async def import_users(
+    records: AsyncIterator[tuple[int, dict[str, Any] | None, str | None]],
+    dedicated_pool: bool = False,
+) -> AsyncIterator[dict[str, Any]]:
+    batch: list[tuple[int, UserCreate]] = []
+    async for line_number, record, error in records:
+        if error is not None:
+            yield {"line": line_number, "status": "invalid", "error": error}
+            continue
+        try:
+            batch.append((line_number, UserCreate.model_validate(record)))
+        except ValidationError as e:
+            yield {
+                "line": line_number,
+                "status": "invalid",
+                "error": "; ".join(err["msg"] for err in e.errors()),
+            }
+            continue
+        if len(batch) >= config.app.bulk_import_batch_size:
+            for entry in await _insert_batch(batch, dedicated_pool):
+                yield entry
+            batch = []
+    if batch:
+        for entry in await _insert_batch(batch, dedicated_pool):
+            yield entry
+
+
+async def _insert_batch(
+    batch: list[tuple[int, UserCreate]], dedicated_pool: bool
+) -> list[dict[str, Any]]:
+    report: list[dict[str, Any]] = []
+    pending: list[tuple[int, UserCreate]] = []
+    seen_emails: set[str] = set()
+    seen_usernames: set[str] = set()
+    for line_number, user in batch:
+        if user.email in seen_emails or user.username in seen_usernames:
+            report.append(_conflict(line_number, user))
+            continue
+        seen_emails.add(user.email)
+        seen_usernames.add(user.username)
+        pending.append((line_number, user))
+
+    hashes = await hash_passwords_parallel(
+        [user.password for _, user in pending], dedicated_pool
+    )
+    rows = [
+        {
+            "email": user.email,
+            "username": user.username,
+            "password_hash": password_hash,
+        }
+        for (_, user), password_hash in zip(pending, hashes)
+    ]
+    async with engine.begin() as connection:
+        result = await connection.execute(_insert_users, rows)
+        created = {row.email: row.id for row in result}
+
+    for line_number, user in pending:
+        user_id = created.get(user.email)
+        if user_id is None:
+            report.append(_conflict(line_number, user))
+        else:
+            report.append({"line": line_number, "status": "created", "id": user_id})
+    report.sort(key=lambda entry: entry["line"])
+    return report
+
+
+def _conflict(line_number: int, user: UserCreate) -> dict[str, Any]:
+    return {
+        "line": line_number,
+        "status": "conflict",
+        "email": user.email,
+        "username": user.username,
+    }
+
+
+async def read_chunks(path: str, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    """Read a file in chunks on a worker thread, keeping the event loop free."""
+    source = await asyncio.to_thread(open, path, "rb")
+    try:
+        while chunk := await asyncio.to_thread(source.read, chunk_size):
+            yield chunk
+    finally:
+        await asyncio.to_thread(source.close)
+
+
+async def _run_cli(path: str, import_format: ImportFormat) -> dict[str, int]:
+    counts = {"created": 0, "conflict": 0, "invalid": 0}
+    try:
+        records = iter_records(iter_lines(read_chunks(path)), import_format)
+        async for entry in import_users(records, dedicated_pool=True):
+            counts[entry["status"]] += 1
+            sys.stdout.write(json.dumps(entry) + "\n")
+    finally:
+        shutdown_password_executor()
+        await engine.dispose()
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk import users")
+    parser.add_argument("path", help="CSV (with header) or NDJSON file")
+    parser.add_argument("--format", choices=["csv", "ndjson"], default=None)
+    args = parser.parse_args()
+    import_format = args.format or ("csv" if args.path.endswith(".csv") else "ndjson")
+    counts = asyncio.run(_run_cli(args.path, import_format))
+    print(json.dumps(counts), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
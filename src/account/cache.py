@@ -0,0 +1,28 @@
+from typing import Hashable
+
+from src.core.config import config
+from src.core.metrics import register_cache
+from src.utils.cache import TTLCache
+
+user_cache = TTLCache(
+    maxsize=config.auth.user_cache_size,
+    ttl=config.auth.user_cache_ttl,
+)
+register_cache("user", user_cache)
+
+# Users this worker wrote recently, keyed by id, ("email", ...) and
+# ("username", ...). Reads of them skip the replicas, which may still hold the
+# row as it was before the write.
+recent_writes = TTLCache(
+    maxsize=config.auth.user_cache_size,
+    ttl=config.database.replica_read_after_write,
+)
+
+
+def mark_written(*keys: Hashable) -> None:
+    for key in keys:
+        recent_writes.set(key, True)
+
+
+def recently_written(key: Hashable) -> bool:
+    return recent_writes.get(key, False)
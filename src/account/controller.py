@@ -1,17 +1,43 @@
+import asyncio
 import logging
+from tempfile import SpooledTemporaryFile
+from typing import IO, AsyncIterator, Literal
 
-from litestar import Controller, delete, get, post
+from litestar import Controller, Request, Response, delete, get, post
 from litestar.di import Provide
 from litestar.exceptions import HTTPException
+from litestar.params import Parameter
+from litestar.response import Stream
+from litestar.serialization import encode_json
 from litestar.status_codes import (
+    HTTP_200_OK,
     HTTP_201_CREATED,
     HTTP_204_NO_CONTENT,
     HTTP_404_NOT_FOUND,
     HTTP_409_CONFLICT,
+    HTTP_503_SERVICE_UNAVAILABLE,
 )
+import msgspec
+from sqlalchemy.ext.asyncio import AsyncConnection
 
-from src.account.schemas import UserCreate, UserListResponse, UserResponse
-from src.account.services import UserService, provide_user_service
+from src.account.loader import user_loader
+from src.account.schemas import (
+    UserBatchRecord,
+    UserBatchRequest,
+    UserCreate,
+    UserListRecord,
+    UserListResponse,
+    UserRecord,
+    UserResponse,
+)
+from src.account.services import (
+    UserReader,
+    UserService,
+    provide_user_service,
+    stream_user_rows,
+)
+from src.auth.dependencies import provide_read_connection
+from src.core.config import config
 
 logger = logging.getLogger(__name__)
 
@@ -19,20 +45,49 @@ logger = logging.getLogger(__name__)
 class UserController(Controller):
     tags = ["User Accounts"]
     path = "/users"
-    dependencies = {"user_service": Provide(provide_user_service)}
+    dependencies = {
+        "user_service": Provide(provide_user_service),
+        "read_connection": Provide(provide_read_connection),
+    }
 
     @get("/")
     async def list_users(
         self,
-        user_service: UserService,
-    ) -> list[UserListResponse]:
+        read_connection: AsyncConnection,
+        limit: int = Parameter(
+            default=config.app.page_size_default, ge=1, le=config.app.page_size_max
+        ),
+        after: int | None = Parameter(default=None, ge=0),
+    ) -> Response[list[UserListResponse]]:
         try:
-            users = await user_service.get_all()
-            return [UserListResponse.model_validate(user) for user in users]
+            users, next_cursor = await UserReader(read_connection).list_page(
+                limit, after
+            )
+            headers = {}
+            if next_cursor is not None:
+                headers["X-Next-Cursor"] = str(next_cursor)
+            return Response(users, headers=headers)
         except Exception as e:
             logger.error(f"Error in list_users: {e}", exc_info=True)
             raise
 
+    @get("/stream")
+    async def stream_users(
+        self,
+        after: int | None = Parameter(default=None, ge=0),
+        output_format: Literal["json", "ndjson"] = Parameter(
+            query="format", default="ndjson"
+        ),
+    ) -> Stream:
+        media_type = (
+            "application/x-ndjson"
+            if output_format == "ndjson"
+            else "application/json"
+        )
+        return Stream(
+            _encode_user_rows(after, output_format), media_type=media_type
+        )
+
     @post("/", status_code=HTTP_201_CREATED)
     async def create_user(
         self,
@@ -45,18 +100,60 @@ class UserController(Controller):
         except ValueError as e:
             raise HTTPException(status_code=HTTP_409_CONFLICT, detail=str(e))  # noqa: B904
 
-    @get(path="/{user_id:int}")
-    async def get_user(
+    @post("/bulk", status_code=HTTP_200_OK)
+    async def bulk_create_users(self, request: Request) -> Stream:
+        from src.account.bulk import import_users, iter_lines, iter_records
+        from src.utils.password import shared_bulk_hashing_available
+
+        if not shared_bulk_hashing_available():
+            raise HTTPException(
+                status_code=HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Bulk import needs PASSWORD_HASH_MAX_WORKERS >= 2;"
+                " use python -m src.account.bulk instead",
+            )
+        content_type = request.headers.get("content-type", "")
+        import_format = "csv" if "csv" in content_type else "ndjson"
+        report = SpooledTemporaryFile(max_size=config.app.bulk_report_spool_bytes)
+        records = iter_records(iter_lines(request.stream()), import_format)
+        # The report may spill to disk, so it is written in chunks off the loop.
+        pending = bytearray()
+        async for entry in import_users(records):
+            pending += encode_json(entry) + b"\n"
+            if len(pending) >= _REPORT_CHUNK:
+                await asyncio.to_thread(report.write, bytes(pending))
+                pending.clear()
+        await asyncio.to_thread(report.write, bytes(pending))
+        await asyncio.to_thread(report.seek, 0)
+        return Stream(_read_report(report), media_type="application/x-ndjson")
+
+    @post("/batch-get", status_code=HTTP_200_OK)
+    async def batch_get_users(
         self,
-        user_service: UserService,
-        user_id: int,
-    ) -> UserResponse:
-        user = await user_service.get_by_id(user_id)
+        read_connection: AsyncConnection,
+        data: UserBatchRequest,
+    ) -> Response[UserBatchRecord]:
+        ids = list(dict.fromkeys(data.ids))
+        found = await UserReader(read_connection).get_records(ids)
+        return Response(
+            UserBatchRecord(
+                users=[found[user_id] for user_id in ids if user_id in found],
+                missing=[user_id for user_id in ids if user_id not in found],
+            )
+        )
+
+    @get(path="/{user_id:int}")
+    async def get_user(self, request: Request, user_id: int) -> Response[UserResponse]:
+        # Authentication already loaded the caller, usually from user_cache, so
+        # reading one's own profile needs no connection at all.
+        principal = request.scope.get("user")
+        if isinstance(principal, UserRecord) and principal.id == user_id:
+            return Response(principal)
+        user = await user_loader.load(user_id)
         if not user:
             raise HTTPException(
                 status_code=HTTP_404_NOT_FOUND, detail=f"User {user_id} not found"
             )
-        return UserResponse.model_validate(user)
+        return Response(user)
 
     @delete(path="/{user_id:int}", status_code=HTTP_204_NO_CONTENT)
     async def delete_user(
@@ -68,3 +165,33 @@ class UserController(Controller):
             raise HTTPException(
                 status_code=HTTP_404_NOT_FOUND, detail=f"User {user_id} not found"
             )
+
+
+_encoder = msgspec.json.Encoder()
+_REPORT_CHUNK = 64 * 1024
+
+
+async def _encode_user_rows(
+    after: int | None, output_format: Literal["json", "ndjson"]
+) -> AsyncIterator[bytes]:
+    first = True
+    if output_format == "json":
+        yield b"["
+    async for rows in stream_user_rows(after):
+        records = [UserListRecord(*row) for row in rows]
+        if output_format == "ndjson":
+            yield _encoder.encode_lines(records)
+        else:
+            chunk = _encoder.encode(records)[1:-1]
+            yield chunk if first else b"," + chunk
+        first = False
+    if output_format == "json":
+        yield b"]"
+
+
+async def _read_report(report: IO[bytes]) -> AsyncIterator[bytes]:
+    try:
+        while chunk := await asyncio.to_thread(report.read, _REPORT_CHUNK):
+            yield chunk
+    finally:
+        await asyncio.to_thread(report.close)
@@ -0,0 +1,91 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, Sequence, TypeVar
+
+from src.account.schemas import UserRecord
+from src.core.config import config
+from src.core.database import replica_router
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class BatchLoader(Generic[K, V]):
+    """Coalesce concurrent lookups into batched fetches.
+
+    Callers asking for a key that is already queued or in flight share its
+    future, so each key is fetched at most once at a time. Distinct keys
+    requested within ``window`` seconds (zero means the same event-loop
+    iteration) go out as one ``fetch`` call of up to ``max_batch`` keys.
+    Results are not kept once the batch completes.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[list[K]], Awaitable[dict[K, V]]],
+        window: float = 0.0,
+        max_batch: int = 100,
+    ):
+        self.fetch = fetch
+        self.window = window
+        self.max_batch = max_batch
+        self._futures: dict[K, asyncio.Future] = {}
+        self._queue: list[K] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def load(self, key: K) -> V | None:
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._futures[key] = loop.create_future()
+            self._queue.append(key)
+            if len(self._queue) >= self.max_batch:
+                self._dispatch()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window, self._dispatch)
+        # Shielded so a cancelled caller does not cancel the shared lookup.
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: Sequence[K]) -> list[V | None]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        keys, self._queue = self._queue, []
+        if keys:
+            task = asyncio.create_task(self._run(keys))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, keys: list[K]) -> None:
+        try:
+            values = await self.fetch(keys)
+        except Exception as e:
+            for key in keys:
+                future = self._futures.pop(key)
+                if not future.done():
+                    future.set_exception(e)
+                    # Avoid "exception was never retrieved" if every caller
+                    # was cancelled.
+                    future.exception()
+            return
+        for key in keys:
+            future = self._futures.pop(key)
+            if not future.done():
+                future.set_result(values.get(key))
+
+
+async def _fetch_users(user_ids: list[int]) -> dict[int, UserRecord]:
+    from src.account.services import UserReader
+
+    async with replica_router.read_connection() as connection:
+        return await UserReader(connection).get_records(user_ids)
+
+
+user_loader: BatchLoader[int, UserRecord] = BatchLoader(
+    _fetch_users,
+    window=config.app.user_loader_window_ms / 1000,
+    max_batch=config.app.user_loader_max_batch,
+)
@@ -1,5 +1,13 @@
 from .base import Base, AuditBase
 from .users import User
 from .oauth import OAuthAccount
+from .tokens import AuthSession, RevokedToken
 
-__all__ = ["Base", "AuditBase", "User", "OAuthAccount"]
+__all__ = [
+    "Base",
+    "AuditBase",
+    "User",
+    "OAuthAccount",
+    "RevokedToken",
+    "AuthSession",
+]
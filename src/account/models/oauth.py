@@ -10,6 +10,7 @@ class OAuthAccount(AuditBase):
 
     user_id: Mapped[int] = mapped_column(
         ForeignKey("user_account.id", ondelete="CASCADE"),
+        index=True,
         nullable=False,
     )
 
@@ -18,7 +19,10 @@ class OAuthAccount(AuditBase):
     provider_email: Mapped[str] = mapped_column(String(255), nullable=False)
     access_token: Mapped[str] = mapped_column(String(500))
     refresh_token: Mapped[str] = mapped_column(String(500))
-    expires_at: Mapped[int] = mapped_column(nullable=True)
+    expires_at: Mapped[int] = mapped_column(index=True, nullable=True)
+    # Epoch lease taken by the token refresher when it claims the account. It
+    # is kept after the refresh, so the account is not claimed again before.
+    refresh_claimed_until: Mapped[int | None] = mapped_column(nullable=True)
 
     __table_args__ = (
         UniqueConstraint(
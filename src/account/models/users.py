@@ -1,5 +1,7 @@
+from datetime import datetime
+
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String
+from sqlalchemy import DateTime, Index, String, text
 
 from src.account.models.base import AuditBase
 
@@ -8,5 +10,19 @@ class User(AuditBase):
     __tablename__ = "user_account"
 
     email: Mapped[str] = mapped_column(String, unique=True, index=True, nullable=False)
-    username: Mapped[str] = mapped_column(String, nullable=True)
+    username: Mapped[str] = mapped_column(
+        String, unique=True, index=True, nullable=True
+    )
     password_hash: Mapped[str] = mapped_column(String, nullable=False)
+    # Set by a soft delete; the row and its dependents are purged later.
+    deleted_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    __table_args__ = (
+        Index(
+            "ix_user_account_deleted_at",
+            "deleted_at",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+        ),
+    )
@@ -0,0 +1,87 @@
+import asyncio
+import logging
+
+from sqlalchemy import Delete, delete, select
+
+from src.account.models.oauth import OAuthAccount
+from src.account.models.tokens import AuthSession
+from src.account.models.users import User
+from src.core.config import config
+from src.core.database import engine
+
+logger = logging.getLogger(__name__)
+
+user_account = User.__table__
+oauth_account = OAuthAccount.__table__
+auth_session = AuthSession.__table__
+
+
+def _batched_delete(table, where, batch_size: int) -> Delete:
+    claimed = (
+        select(table.c.id)
+        .where(where)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    return delete(table).where(table.c.id.in_(claimed))
+
+
+def purge_statements(batch_size: int) -> list[Delete]:
+    """Dependents first, so the final user delete has nothing left to cascade."""
+    deleted_users = select(user_account.c.id).where(
+        user_account.c.deleted_at.is_not(None)
+    )
+    return [
+        _batched_delete(
+            oauth_account, oauth_account.c.user_id.in_(deleted_users), batch_size
+        ),
+        _batched_delete(
+            auth_session, auth_session.c.user_id.in_(deleted_users), batch_size
+        ),
+        _batched_delete(
+            user_account, user_account.c.deleted_at.is_not(None), batch_size
+        ),
+    ]
+
+
+async def purge_deleted_users(batch_size: int) -> int:
+    """Purge soft-deleted users and their rows in batches; return users purged."""
+    purged = 0
+    for stmt in purge_statements(batch_size):
+        while True:
+            async with engine.begin() as connection:
+                result = await connection.execute(stmt)
+            if stmt.table is user_account:
+                purged += result.rowcount
+            if result.rowcount < batch_size:
+                break
+            await asyncio.sleep(config.app.user_purge_pause)
+    return purged
+
+
+class UserPurger:
+    def __init__(self):
+        self._task: asyncio.Task | None = None
+
+    async def _run_forever(self) -> None:
+        while True:
+            await asyncio.sleep(config.app.user_purge_interval)
+            try:
+                purged = await purge_deleted_users(config.app.user_purge_batch_size)
+                if purged:
+                    logger.info(f"Purged {purged} soft-deleted users")
+            except Exception as e:
+                logger.error(f"Deleted user purge failed: {e}")
+
+    async def start(self) -> None:
+        if config.app.user_soft_delete:
+            self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+user_purger = UserPurger()
@@ -0,0 +1,47 @@
+"""Hot user lookups, built once with bound parameters.
+
+Building these at import time takes statement construction off the request
+path, and the fixed SQL text lets every call hit SQLAlchemy's compiled cache
+and asyncpg's prepared statement cache. Execute them with a parameter dict,
+e.g. ``session.execute(USER_BY_ID, {"user_id": 1})``.
+"""
+
+from sqlalchemy import ARRAY, Integer, any_, bindparam, delete, func, select, update
+
+from src.account.models.users import User
+
+# Soft-deleted users are invisible to every read until they are purged.
+_live = User.deleted_at.is_(None)
+
+USER_BY_ID = select(User).where(User.id == bindparam("user_id"), _live)
+USER_BY_EMAIL = select(User).where(User.email == bindparam("email"), _live)
+USER_BY_USERNAME = select(User).where(User.username == bindparam("username"), _live)
+
+# ``= ANY(:ids)`` keeps one statement text for any number of ids, unlike an
+# expanding IN list.
+_ids = bindparam("ids", type_=ARRAY(Integer))
+USER_RECORDS_BY_IDS = select(
+    User.id, User.email, User.username, User.created_at, User.updated_at
+).where(User.id == any_(_ids), _live)
+
+_user_list_columns = (
+    select(User.id, User.email, User.username).where(_live).order_by(User.id)
+)
+USER_PAGE = _user_list_columns.limit(bindparam("limit"))
+USER_PAGE_AFTER = _user_list_columns.where(User.id > bindparam("after")).limit(
+    bindparam("limit")
+)
+
+DELETE_USER = (
+    delete(User)
+    .where(User.id == bindparam("user_id"), _live)
+    .returning(User.id, User.email, User.username)
+    .execution_options(synchronize_session=False)
+)
+SOFT_DELETE_USER = (
+    update(User)
+    .where(User.id == bindparam("user_id"), _live)
+    .values(deleted_at=func.now())
+    .returning(User.id, User.email, User.username)
+    .execution_options(synchronize_session=False)
+)
@@ -1,6 +1,9 @@
 from datetime import datetime
 
-from pydantic import BaseModel, ConfigDict, EmailStr, field_validator
+import msgspec
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
+
+from src.core.config import config
 
 
 class UserCreate(BaseModel):
@@ -51,3 +54,29 @@ class UserListResponse(BaseModel):
     username: str
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class UserBatchRequest(BaseModel):
+    ids: list[int] = Field(min_length=1, max_length=config.app.batch_get_max_ids)
+
+
+# Read-path twins of the response models above. They skip Pydantic validation
+# and are encoded by msgspec, producing the same JSON.
+class UserRecord(msgspec.Struct):
+    id: int
+    email: str
+    username: str
+    created_at: datetime
+    updated_at: datetime
+
+
+class UserListRecord(msgspec.Struct):
+    id: int
+    email: str
+    username: str
+
+
+# Body of POST /users/batch-get; there is no Pydantic twin.
+class UserBatchRecord(msgspec.Struct):
+    users: list[UserRecord]
+    missing: list[int]
@@ -1,82 +1,229 @@
 import logging
+from typing import Any, AsyncIterator, Callable, Hashable, Sequence, TypeVar
 
-from sqlalchemy import select
+from sqlalchemy import Result, Row, Select, or_, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 
+from src.account import queries
+from src.account.cache import mark_written, recently_written, user_cache
 from src.account.models.users import User
-from src.account.schemas import UserCreate, UserUpdate
-from src.utils.password import hash_password
+from src.account.schemas import (
+    UserCreate,
+    UserListRecord,
+    UserRecord,
+    UserUpdate,
+)
+from src.auth.revocation import revocation_store
+from src.core.config import config
+from src.core.database import engine, replica_router
+from src.utils.password import hash_password_async
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 class UserService:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get_all(self) -> list[User]:
-        result = await self.session.execute(select(User))
-        return list(result.scalars().all())
+    async def _read(
+        self,
+        stmt: Select[Any],
+        params: dict[str, Any],
+        fetch: Callable[[Result[Any]], T],
+        key: Hashable,
+    ) -> T:
+        """Run a read on a replica when one is healthy.
+
+        The primary answers instead when this worker wrote ``key`` recently,
+        no replica is available, the replica fails, or a single-row lookup
+        comes back empty (a user created moments ago).
+        """
+        if recently_written(key):
+            return fetch(await self.session.execute(stmt, params))
+        async with replica_router.read_session() as replica:
+            if replica is not None:
+                value = fetch(await replica.execute(stmt, params))
+                if value is not None:
+                    return value
+        return fetch(await self.session.execute(stmt, params))
 
     async def get_by_id(self, user_id: int) -> User | None:
-        result = await self.session.execute(select(User).where(User.id == user_id))
-        return result.scalar_one_or_none()
+        return await self._read(
+            queries.USER_BY_ID,
+            {"user_id": user_id},
+            lambda result: result.scalar_one_or_none(),
+            user_id,
+        )
 
     async def get_by_email(self, email: str) -> User | None:
-        result = await self.session.execute(select(User).where(User.email == email))
-        return result.scalar_one_or_none()
+        return await self._read(
+            queries.USER_BY_EMAIL,
+            {"email": email},
+            lambda result: result.scalar_one_or_none(),
+            ("email", email),
+        )
 
     async def get_by_username(self, username: str) -> User | None:
-        result = await self.session.execute(
-            select(User).where(User.username == username)
+        return await self._read(
+            queries.USER_BY_USERNAME,
+            {"username": username},
+            lambda result: result.scalar_one_or_none(),
+            ("username", username),
         )
-        return result.scalar_one_or_none()
-
-    async def create(self, user_data: UserCreate):
-        if await self.get_by_email(user_data.email):
-            raise ValueError(f"User with email {user_data.email} already exists")  # noqa: EM102
 
-        if await self.get_by_username(user_data.username):
-            raise ValueError(f"User with username {user_data.username} already exists")  # noqa: EM102
+    async def _get_for_write(self, user_id: int) -> User | None:
+        result = await self.session.execute(queries.USER_BY_ID, {"user_id": user_id})
+        return result.scalar_one_or_none()
 
-        password_hash = hash_password(user_data.password)
-        user = User(
-            email=user_data.email,
-            username=user_data.username,
-            password_hash=password_hash,
+    async def create(self, user_data: UserCreate) -> User:
+        password_hash = await hash_password_async(user_data.password)
+        stmt = (
+            insert(User)
+            .values(
+                email=user_data.email,
+                username=user_data.username,
+                password_hash=password_hash,
+            )
+            .on_conflict_do_nothing()
+            .returning(User)
         )
-        self.session.add(user)
         try:
+            result = await self.session.execute(stmt)
+            user = result.scalar_one_or_none()
             await self.session.commit()
-            await self.session.refresh(user)
-            return user
         except IntegrityError as e:
             await self.session.rollback()
             raise ValueError(f"Database error: {str(e)}")  # noqa: B904, EM102
+        if user is None:
+            await self._raise_conflict(user_data)
+        return user
+
+    async def _raise_conflict(self, user_data: UserCreate) -> None:
+        result = await self.session.execute(
+            select(User.email, User.username).where(
+                or_(
+                    User.email == user_data.email,
+                    User.username == user_data.username,
+                )
+            )
+        )
+        if any(row.email == user_data.email for row in result):
+            raise ValueError(f"User with email {user_data.email} already exists")  # noqa: EM102
+        raise ValueError(f"User with username {user_data.username} already exists")  # noqa: EM102
 
     async def update(self, user_id: str, user_data: UserUpdate) -> User | None:
-        user = await self.get_by_id(user_id)
+        user = await self._get_for_write(user_id)
         if not user:
             return None
+        written = _written_keys(user.id, user.email, user.username)
         update_data = user_data.model_dump(exclude_unset=True)
         if "password" in update_data:
-            update_data["password_hash"] = hash_password(update_data.pop("password"))
+            update_data["password_hash"] = await hash_password_async(
+                update_data.pop("password")
+            )
         for field, value in update_data.items():
             if hasattr(user, field):
                 setattr(user, field, value)
         await self.session.commit()
+        mark_written(*written, *_written_keys(user.id, user.email, user.username))
+        user_cache.invalidate(int(user_id))
+        if "password_hash" in update_data or "email" in update_data:
+            await revocation_store.revoke_user(int(user_id))
         await self.session.refresh(user)
         return user
 
     async def delete(self, user_id: str) -> bool:
-        user = await self.get_by_id(user_id)
-        if not user:
-            return False
-        await self.session.delete(user)
+        # One statement either way: a hard delete leaves dependent rows to the
+        # foreign key cascade, a soft delete hides the user at once and leaves
+        # them to the background purge.
+        stmt = (
+            queries.SOFT_DELETE_USER
+            if config.app.user_soft_delete
+            else queries.DELETE_USER
+        )
+        result = await self.session.execute(stmt, {"user_id": int(user_id)})
+        deleted = result.one_or_none()
         await self.session.commit()
+        if deleted is None:
+            return False
+        mark_written(*_written_keys(*deleted))
+        user_cache.invalidate(int(user_id))
+        await revocation_store.revoke_user(int(user_id))
         return True
 
 
+def _written_keys(user_id: int, email: str, username: str) -> tuple[Hashable, ...]:
+    return user_id, ("email", email), ("username", username)
+
+
+class UserReader:
+    """Core-only user reads on a borrowed connection.
+
+    No session, unit of work or identity map: rows go straight into msgspec
+    records. On a replica, users this worker wrote recently and ids that come
+    back missing are read from the primary in case they have not replicated
+    yet.
+    """
+
+    def __init__(self, connection: AsyncConnection):
+        self.connection = connection
+
+    async def list_page(
+        self, limit: int, after: int | None = None
+    ) -> tuple[list[UserListRecord], int | None]:
+        if after is None:
+            stmt, params = queries.USER_PAGE, {"limit": limit + 1}
+        else:
+            stmt, params = queries.USER_PAGE_AFTER, {"limit": limit + 1, "after": after}
+        result = await self.connection.execute(stmt, params)
+        users = [UserListRecord(*row) for row in result]
+        if len(users) > limit:
+            users = users[:limit]
+            return users, users[-1].id
+        return users, None
+
+    async def get_records(self, user_ids: Sequence[int]) -> dict[int, UserRecord]:
+        if self.connection.engine is engine:
+            return await _fetch_records(self.connection, user_ids)
+        settled = [user_id for user_id in user_ids if not recently_written(user_id)]
+        found = await _fetch_records(self.connection, settled) if settled else {}
+        missing = [user_id for user_id in user_ids if user_id not in found]
+        if missing:
+            async with engine.connect() as primary:
+                found.update(await _fetch_records(primary, missing))
+        return found
+
+
+async def _fetch_records(
+    connection: AsyncConnection, user_ids: Sequence[int]
+) -> dict[int, UserRecord]:
+    result = await connection.execute(
+        queries.USER_RECORDS_BY_IDS, {"ids": list(user_ids)}
+    )
+    return {row.id: UserRecord(*row) for row in result}
+
+
+async def stream_user_rows(
+    after: int | None = None,
+) -> AsyncIterator[Sequence[Row]]:
+    chunk_size = config.app.stream_chunk_size
+    stmt = (
+        select(User.id, User.email, User.username)
+        .where(User.deleted_at.is_(None))
+        .order_by(User.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    if after is not None:
+        stmt = stmt.where(User.id > after)
+    async with replica_router.read_connection() as connection:
+        result = await connection.stream(stmt)
+        async for rows in result.partitions(chunk_size):
+            yield rows
+
+
 async def provide_user_service(db_session: AsyncSession) -> UserService:
     return UserService(session=db_session)
@@ -1,16 +1,26 @@
 import logging
 from datetime import timedelta
+from typing import Any
+from uuid import uuid4
 
-from litestar import Controller, post
+from litestar import Controller, Request, post
 from litestar.di import Provide
 from litestar.exceptions import HTTPException
-from litestar.status_codes import HTTP_201_CREATED, HTTP_401_UNAUTHORIZED
+from litestar.security.jwt import Token
+from litestar.status_codes import (
+    HTTP_201_CREATED,
+    HTTP_401_UNAUTHORIZED,
+    HTTP_429_TOO_MANY_REQUESTS,
+)
 
 from src.auth.jwt_auth import jwt_auth
+from src.auth.revocation import revocation_store
+from src.auth.throttle import login_throttle, resolve_client_ip
 from src.core.config import config
 from src.auth.schemas import (
     LoginRequest,
     LoginResponse,
+    LogoutRequest,
     RefreshTokenRequest,
     RegisterRequest,
     TokenResponse,
@@ -18,6 +28,7 @@ from src.auth.schemas import (
 from src.auth.services import TokenService, provide_token_service
 from src.account.services import UserService, provide_user_service
 from src.account.schemas import UserCreate
+from src.utils.password import PasswordHasherBusyError
 
 logger = logging.getLogger(__name__)
 
@@ -33,10 +44,22 @@ class AuthController(Controller):
     @post("/login")
     async def login(
         self,
+        request: Request,
         token_service: TokenService,
         user_service: UserService,
         data: LoginRequest,
     ) -> LoginResponse:
+        client_ip = resolve_client_ip(
+            request.client.host if request.client else "unknown",
+            request.headers.get("x-forwarded-for"),
+        )
+        retry_after = login_throttle.check(client_ip, data.email)
+        if retry_after is not None:
+            raise HTTPException(
+                status_code=HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts",
+                headers={"Retry-After": str(retry_after)},
+            )
         try:
             user = await token_service.authenticate_user(data.email, data.password)
             if not user:
@@ -44,14 +67,16 @@ class AuthController(Controller):
                     status_code=HTTP_401_UNAUTHORIZED,
                     detail="Incorrect email or password",
                 )
+            login_throttle.succeeded(data.email)
             access_token = jwt_auth.create_token(
                 identifier=str(user.id),
                 token_expiration=timedelta(
                     minutes=config.auth.access_token_expire_minutes
                 ),
+                token_unique_jwt_id=uuid4().hex,
                 token_extras={"email": user.email, "type": "access"},
             )
-            refresh_token = token_service.create_refresh_token(user.id, user.email)
+            refresh_token = await token_service.start_session(user.id, user.email)
 
             return LoginResponse(
                 access_token=access_token,
@@ -61,6 +86,8 @@ class AuthController(Controller):
                 email=user.email,
             )
 
+        except (HTTPException, PasswordHasherBusyError):
+            raise
         except Exception as e:
             logger.error(f"Login error: {e}", exc_info=True)
             raise HTTPException(
@@ -88,10 +115,11 @@ class AuthController(Controller):
                 token_expiration=timedelta(
                     minutes=config.auth.access_token_expire_minutes
                 ),
+                token_unique_jwt_id=uuid4().hex,
                 token_extras={"email": user.email, "type": "access"},
             )
 
-            refresh_token = token_service.create_refresh_token(user.id, user.email)
+            refresh_token = await token_service.start_session(user.id, user.email)
 
             return LoginResponse(
                 access_token=access_token,
@@ -101,8 +129,10 @@ class AuthController(Controller):
                 email=user.email,
             )
 
+        except PasswordHasherBusyError:
+            raise
         except ValueError as e:
-            logger.error(f"Registration error: {e}", exc_info=True)
+            logger.info(f"Registration rejected: {e}")
             raise HTTPException(
                 status_code=400,
                 detail=str(e),
@@ -133,6 +163,8 @@ class AuthController(Controller):
                 token_type=result["token_type"],
             )
 
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Token refresh error: {e}", exc_info=True)
             raise HTTPException(
@@ -141,5 +173,20 @@ class AuthController(Controller):
             )
 
     @post("/logout")
-    async def logout(self) -> dict:
+    async def logout(
+        self,
+        request: Request[Any, Token, Any],
+        token_service: TokenService,
+        data: LogoutRequest | None = None,
+    ) -> dict:
+        token = request.auth
+        if token.jti:
+            await revocation_store.revoke_token(token.jti, token.exp)
+        if data is not None:
+            if data.refresh_token:
+                await token_service.revoke_token(
+                    data.refresh_token, user_id=int(token.sub)
+                )
+            if data.all_sessions:
+                await revocation_store.revoke_user(int(token.sub))
         return {"message": "Successfully logged out"}
@@ -1,21 +1,16 @@
 from typing import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncConnection
 
-from src.account.services import UserService
+from src.core.database import replica_router
 
 
-async def provide_db_session() -> AsyncGenerator[AsyncSession, None]:
-    from litestar import Request
+async def provide_read_connection() -> AsyncGenerator[AsyncConnection, None]:
+    """Read-only dependency: one pooled connection for Core queries.
 
-    request: Request = Request
-    sessionmaker = request.app.state.sessionmaker
-    async with sessionmaker() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
-
-
-async def provide_user_service(db_session: AsyncSession) -> UserService:
-    return UserService(session=db_session)
+    Unlike ``db_session`` there is no ORM session, unit of work or identity
+    map, and nothing is committed. Reads go to a healthy replica when one is
+    configured.
+    """
+    async with replica_router.read_connection() as connection:
+        yield connection
@@ -1,56 +1,77 @@
+import logging
+from dataclasses import dataclass
 from datetime import timedelta
 from typing import Any, Optional
 
 from litestar.connection import ASGIConnection
 from litestar.security.jwt import JWTAuth, Token
 
-
-from sqlalchemy.ext.asyncio import AsyncSession
+from src.account.cache import user_cache
+from src.account.loader import user_loader
+from src.auth.revocation import revocation_store
+from src.auth.token_cache import CachedToken
 from src.core.config import config
 
-from sqlalchemy.ext.asyncio import async_sessionmaker
+logger = logging.getLogger(__name__)
 
 
-async def retrieve_user_handler(
-    token: Token, connection: ASGIConnection[Any, Any, Any, Any]
-) -> Optional[Any]:
-    try:
-        user_id = int(token.sub)
-        app = connection.app
+@dataclass(frozen=True, slots=True)
+class TokenPrincipal:
+    id: int
+    email: str | None
+    type: str
 
-        if not hasattr(app.state, "sessionmaker"):
-            from sqlalchemy.ext.asyncio import create_async_engine
 
-            engine = create_async_engine(config.database.url)
-            sessionmaker = async_sessionmaker(
-                engine, expire_on_commit=False, class_=AsyncSession
-            )
-            app.state.sessionmaker = sessionmaker
-        else:
-            sessionmaker = app.state.sessionmaker
+def principal_from_claims(token: Token) -> Optional[TokenPrincipal]:
+    user_id = int(token.sub)
+    token_type = token.extras.get("type", "access")
+    if token_type != "access":
+        return None
+    return TokenPrincipal(
+        id=user_id, email=token.extras.get("email"), type=token_type
+    )
 
-        async with sessionmaker() as db_session:
-            from src.account.services import UserService
 
-            user_service = UserService(session=db_session)
-            user = await user_service.get_by_id(user_id)
+async def retrieve_user_handler(
+    token: Token, connection: ASGIConnection[Any, Any, Any, Any]
+) -> Optional[Any]:
+    try:
+        if is_token_revoked(token):
+            return None
+        if config.auth.stateless:
+            return principal_from_claims(token)
 
+        user_id = int(token.sub)
+        user = user_cache.get(user_id)
+        if user is not None:
             return user
+
+        user = await user_loader.load(user_id)
+        if user is not None:
+            user_cache.set(user_id, user)
+        return user
     except Exception as e:
-        print(f"Error retrieving user from token: {e}")
+        logger.warning(f"Error retrieving user from token: {e}")
         return None
 
 
+def is_token_revoked(token: Token) -> bool:
+    return revocation_store.is_revoked(
+        token.jti, int(token.sub), token.iat.timestamp()
+    )
+
+
 async def revoked_token_handler(
     token: Token, connection: ASGIConnection[Any, Any, Any, Any]
 ) -> bool:
-    return False
+    return is_token_revoked(token)
 
 
-jwt_auth = JWTAuth[Any, Token](
+jwt_auth = JWTAuth[Any, CachedToken](
     token_secret=config.auth.jwt_secret,
     retrieve_user_handler=retrieve_user_handler,
     revoked_token_handler=revoked_token_handler,
+    token_cls=CachedToken,
     algorithm=config.auth.jwt_algorithm,
     auth_header="Authorization",
     default_token_expiration=timedelta(minutes=config.auth.access_token_expire_minutes),
@@ -58,6 +79,8 @@ jwt_auth = JWTAuth[Any, Token](
         "/auth/login",
         "/auth/register",
         "/auth/refresh",
+        "/health",
+        "/metrics",
         "/schema",
         "/docs",
         "/redoc",
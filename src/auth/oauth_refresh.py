@@ -0,0 +1,276 @@
+"""Refresh OAuth access tokens shortly before they expire."""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import bindparam, or_, select, tuple_, update
+from sqlalchemy.engine import Row
+
+from src.account.models.oauth import OAuthAccount
+from src.core.config import OAuthProviderConfig, config
+from src.core.database import engine
+from src.core.metrics import oauth_token_refresh
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+oauth_account = OAuthAccount.__table__
+
+# Claiming only stamps a short lease and commits, so no connection or row lock
+# is held while the providers are called. Workers skip rows locked by a
+# concurrent claim and rows claimed since the pass started: their lease is
+# kept after a successful store too, so an account whose new token is due
+# again right away waits for the lease to lapse instead of rejoining the pass.
+# Claims page through the expires_at index by (expires_at, id) keyset.
+_due_accounts = (
+    select(oauth_account.c.id)
+    .where(
+        oauth_account.c.expires_at < bindparam("due_before"),
+        oauth_account.c.expires_at >= bindparam("after_expires_at"),
+        tuple_(oauth_account.c.expires_at, oauth_account.c.id)
+        > tuple_(bindparam("after_expires_at"), bindparam("after_id")),
+        oauth_account.c.provider.in_(bindparam("providers", expanding=True)),
+        or_(
+            oauth_account.c.refresh_claimed_until.is_(None),
+            oauth_account.c.refresh_claimed_until < bindparam("pass_started"),
+        ),
+    )
+    .order_by(oauth_account.c.expires_at, oauth_account.c.id)
+    .limit(bindparam("limit"))
+    .with_for_update(skip_locked=True)
+    .scalar_subquery()
+)
+CLAIM_DUE_ACCOUNTS = (
+    update(oauth_account)
+    .where(oauth_account.c.id.in_(_due_accounts))
+    .values(refresh_claimed_until=bindparam("claimed_until"))
+    .returning(
+        oauth_account.c.id,
+        oauth_account.c.provider,
+        oauth_account.c.access_token,
+        oauth_account.c.refresh_token,
+        oauth_account.c.expires_at,
+    )
+)
+# Only the holder of the lease may write back; a claim that outlived its lease
+# may have been taken over by another worker.
+STORE_TOKENS = (
+    update(oauth_account)
+    .where(
+        oauth_account.c.id == bindparam("account_id"),
+        oauth_account.c.refresh_claimed_until == bindparam("claimed_until"),
+    )
+    .values(
+        access_token=bindparam("new_access_token"),
+        refresh_token=bindparam("new_refresh_token"),
+        expires_at=bindparam("new_expires_at"),
+    )
+)
+
+
+@dataclass
+class RefreshPass:
+    """Keyset position of one pass over the due accounts."""
+
+    started: int
+    after: tuple[int, int] = (-1, 0)
+
+
+def _oauth_error(response: "httpx.Response") -> str | None:
+    try:
+        payload = response.json()
+    except ValueError:
+        return None
+    return payload.get("error") if isinstance(payload, dict) else None
+
+
+class OAuthTokenRefresher:
+    def __init__(self):
+        self._task: asyncio.Task | None = None
+        self._client: "httpx.AsyncClient | None" = None
+        self._limits: dict[str, asyncio.Semaphore] = {}
+
+    async def _refresh(
+        self, account: Row, provider: OAuthProviderConfig
+    ) -> dict[str, Any] | None:
+        """Return the row update for ``account`` or None to retry later."""
+        async with self._limits[account.provider]:
+            try:
+                response = await self._client.post(
+                    provider.token_url,
+                    data={
+                        "grant_type": "refresh_token",
+                        "refresh_token": account.refresh_token,
+                        "client_id": provider.client_id,
+                        "client_secret": provider.client_secret,
+                    },
+                    headers={"Accept": "application/json"},
+                )
+            except Exception as e:
+                logger.warning(f"OAuth refresh for account {account.id} failed: {e}")
+                oauth_token_refresh.inc(provider=account.provider, result="error")
+                return None
+
+        if response.status_code in (400, 401):
+            error = _oauth_error(response)
+            if error == "invalid_grant":
+                # The grant was revoked; drop the expiry so the account is not
+                # claimed again until the user re-links it.
+                logger.warning(
+                    f"OAuth refresh token of account {account.id} was rejected "
+                    f"by {account.provider}"
+                )
+                oauth_token_refresh.inc(provider=account.provider, result="rejected")
+                return {
+                    "account_id": account.id,
+                    "new_access_token": account.access_token,
+                    "new_refresh_token": account.refresh_token,
+                    "new_expires_at": None,
+                }
+            # Anything else, such as a bad client secret or a provider hiccup,
+            # is retried once the lease lapses.
+            if error == "invalid_client":
+                logger.error(
+                    f"OAuth provider {account.provider} rejected the client "
+                    "credentials; check its client id and secret"
+                )
+            else:
+                logger.warning(
+                    f"OAuth refresh for account {account.id} failed with "
+                    f"{response.status_code} ({error})"
+                )
+            oauth_token_refresh.inc(provider=account.provider, result="error")
+            return None
+        if response.status_code != 200:
+            oauth_token_refresh.inc(provider=account.provider, result="error")
+            return None
+
+        try:
+            payload = response.json()
+            access_token = payload["access_token"]
+            expires_in = payload.get("expires_in")
+            expires_at = None if expires_in is None else time.time() + int(expires_in)
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Malformed OAuth token response for {account.id}: {e}")
+            oauth_token_refresh.inc(provider=account.provider, result="error")
+            return None
+
+        oauth_token_refresh.inc(provider=account.provider, result="refreshed")
+        return {
+            "account_id": account.id,
+            "new_access_token": access_token,
+            "new_refresh_token": payload.get("refresh_token", account.refresh_token),
+            "new_expires_at": None if expires_at is None else int(expires_at),
+        }
+
+    async def _claim(self, refresh_pass: RefreshPass) -> tuple[list[Row], int]:
+        claimed_until = int(time.time()) + config.oauth.refresh_lease
+        after_expires_at, after_id = refresh_pass.after
+        async with engine.begin() as connection:
+            result = await connection.execute(
+                CLAIM_DUE_ACCOUNTS,
+                {
+                    "due_before": refresh_pass.started + config.oauth.refresh_lead,
+                    "after_expires_at": after_expires_at,
+                    "after_id": after_id,
+                    "providers": list(config.oauth.providers),
+                    "pass_started": refresh_pass.started,
+                    "limit": config.oauth.refresh_batch_size,
+                    "claimed_until": claimed_until,
+                },
+            )
+            return result.all(), claimed_until
+
+    async def _store(self, updates: list[dict[str, Any]]) -> None:
+        async with engine.begin() as connection:
+            await connection.execute(STORE_TOKENS, updates)
+
+    async def refresh_batch(self, refresh_pass: RefreshPass) -> tuple[int, int]:
+        """Claim, refresh and store one batch; return (claimed, stored).
+
+        Moves ``refresh_pass`` past the claimed accounts. Accounts that failed
+        keep their lease and are retried once it lapses.
+        """
+        accounts, claimed_until = await self._claim(refresh_pass)
+        if not accounts:
+            return 0, 0
+        refresh_pass.after = max(
+            (account.expires_at, account.id) for account in accounts
+        )
+        providers = config.oauth.providers
+        updates = await asyncio.gather(
+            *(
+                self._refresh(account, providers[account.provider])
+                for account in accounts
+            )
+        )
+        updates = [
+            {**params, "claimed_until": claimed_until}
+            for params in updates
+            if params is not None
+        ]
+        if updates:
+            await self._store(updates)
+        return len(accounts), len(updates)
+
+    async def refresh_due_accounts(self) -> int:
+        """Refresh batches until nothing is due; return the number stored.
+
+        Each account is claimed at most once per pass, so a token issued with
+        less than OAUTH_REFRESH_LEAD to live cannot keep the pass going.
+        """
+        refresh_pass = RefreshPass(started=int(time.time()))
+        total = 0
+        while True:
+            claimed, stored = await self.refresh_batch(refresh_pass)
+            total += stored
+            if claimed < config.oauth.refresh_batch_size:
+                return total
+
+    async def _run_forever(self) -> None:
+        while True:
+            await asyncio.sleep(config.oauth.refresh_interval)
+            try:
+                refreshed = await self.refresh_due_accounts()
+                if refreshed:
+                    logger.info(f"Refreshed {refreshed} OAuth tokens")
+            except Exception as e:
+                logger.error(f"OAuth token refresh failed: {e}")
+
+    async def start(self) -> None:
+        if not config.oauth.providers:
+            return
+        try:
+            import httpx
+        except ImportError:
+            logger.warning("httpx is not installed; OAuth token refresh disabled")
+            return
+
+        self._client = httpx.AsyncClient(
+            timeout=config.oauth.refresh_timeout,
+            limits=httpx.Limits(
+                max_connections=config.oauth.refresh_max_connections,
+                max_keepalive_connections=config.oauth.refresh_max_connections,
+            ),
+        )
+        self._limits = {
+            name: asyncio.Semaphore(provider.concurrency)
+            for name, provider in config.oauth.providers.items()
+        }
+        self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+oauth_refresher = OAuthTokenRefresher()
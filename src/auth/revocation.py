@@ -0,0 +1,139 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from src.account.models.tokens import RevokedToken
+from src.core.config import config
+from src.core.database import engine
+
+logger = logging.getLogger(__name__)
+
+_revoked = RevokedToken.__table__
+
+
+class RevocationStore:
+    """In-memory mirror of ``revoked_token`` for O(1) per-request checks.
+
+    Revocations are written through to the table and every worker re-reads
+    recent rows on a timer, so a revocation reaches all workers within
+    ``revocation_sync_interval`` seconds. Expired entries are pruned from
+    memory and deleted from the table.
+    """
+
+    def __init__(self):
+        self._tokens: dict[str, float] = {}
+        self._users: dict[int, tuple[float, float]] = {}
+        self._task: asyncio.Task | None = None
+        self._loaded = False
+        self._last_purge = 0.0
+
+    def __len__(self) -> int:
+        return len(self._tokens) + len(self._users)
+
+    def is_revoked(self, jti: str | None, user_id: int, issued_at: float) -> bool:
+        if jti is not None and jti in self._tokens:
+            return True
+        entry = self._users.get(user_id)
+        return entry is not None and issued_at < entry[0]
+
+    async def revoke_token(self, jti: str, expires_at: datetime) -> None:
+        self._tokens[jti] = expires_at.timestamp()
+        await self._persist(jti=jti, expires_at=expires_at)
+
+    async def revoke_user(self, user_id: int) -> None:
+        # Token iat has second precision, so tokens minted within the same
+        # second as the revocation stay valid.
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        expires_at = now + timedelta(days=config.auth.refresh_token_expire_days)
+        self._remember_user(user_id, now.timestamp(), expires_at.timestamp())
+        await self._persist(user_id=user_id, issued_before=now, expires_at=expires_at)
+
+    def _remember_user(
+        self, user_id: int, issued_before: float, expires: float
+    ) -> None:
+        current = self._users.get(user_id)
+        if current is None or current[0] < issued_before:
+            self._users[user_id] = (issued_before, expires)
+
+    def _mirror(self, row) -> None:
+        if row.jti is not None:
+            self._tokens[row.jti] = row.expires_at.timestamp()
+        elif row.user_id is not None and row.issued_before is not None:
+            self._remember_user(
+                row.user_id,
+                row.issued_before.timestamp(),
+                row.expires_at.timestamp(),
+            )
+
+    async def _persist(self, **values) -> None:
+        async with engine.begin() as connection:
+            await connection.execute(
+                insert(_revoked).values(**values).on_conflict_do_nothing()
+            )
+
+    async def load(self, since: timedelta | None = None) -> None:
+        stmt = select(
+            _revoked.c.jti,
+            _revoked.c.user_id,
+            _revoked.c.issued_before,
+            _revoked.c.expires_at,
+        ).where(_revoked.c.expires_at > func.now())
+        if since is not None:
+            stmt = stmt.where(_revoked.c.created_at > func.now() - since)
+        async with engine.connect() as connection:
+            result = await connection.execute(stmt)
+            for row in result:
+                self._mirror(row)
+        if since is None:
+            self._loaded = True
+
+    def prune(self) -> None:
+        now = time.time()
+        self._tokens = {
+            jti: expires for jti, expires in self._tokens.items() if expires > now
+        }
+        self._users = {
+            user_id: entry for user_id, entry in self._users.items() if entry[1] > now
+        }
+
+    async def purge_expired(self) -> None:
+        async with engine.begin() as connection:
+            await connection.execute(
+                delete(_revoked).where(_revoked.c.expires_at <= func.now())
+            )
+
+    async def _sync_forever(self) -> None:
+        interval = config.auth.revocation_sync_interval
+        purge_interval = config.auth.revocation_purge_interval
+        # Re-read a window wider than the interval so rows committed late
+        # by slow transactions are not missed.
+        window = timedelta(seconds=interval * 2 + 30)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.load(since=window if self._loaded else None)
+                self.prune()
+                if time.monotonic() - self._last_purge > purge_interval:
+                    await self.purge_expired()
+                    self._last_purge = time.monotonic()
+            except Exception as e:
+                logger.error(f"Revocation sync failed: {e}")
+
+    async def start(self) -> None:
+        try:
+            await self.load()
+        except Exception as e:
+            logger.error(f"Initial revocation load failed: {e}")
+        self._task = asyncio.create_task(self._sync_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+revocation_store = RevocationStore()
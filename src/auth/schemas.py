@@ -30,3 +30,8 @@ class TokenResponse(BaseModel):
     access_token: str
     refresh_token: str | None = None
     token_type: str = "bearer"
+
+
+class LogoutRequest(BaseModel):
+    refresh_token: str | None = None
+    all_sessions: bool = False
@@ -1,17 +1,27 @@
+import logging
 from datetime import datetime, timedelta, timezone
 from typing import Optional
+from uuid import uuid4
 
 import jwt
+from sqlalchemy import delete, func, insert, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.account.cache import user_cache
 from src.account.models.users import User
 from src.account.services import UserService
+from src.auth.revocation import revocation_store
+from src.auth.sessions import auth_session, hash_refresh_token
+from src.auth.token_cache import verified_payload
 from src.core.config import config
 
+logger = logging.getLogger(__name__)
+
 
 class TokenService:
     def __init__(self, user_service: UserService):
         self.user_service = user_service
+        self.session = user_service.session
         self.secret = config.auth.jwt_secret
         self.algorithm = config.auth.jwt_algorithm
 
@@ -33,6 +43,7 @@ class TokenService:
             "email": email,
             "exp": expire,
             "iat": datetime.now(timezone.utc),
+            "jti": uuid4().hex,
             "type": "access",
         }
 
@@ -43,6 +54,7 @@ class TokenService:
         user_id: int,
         email: str,
         expires_delta: Optional[timedelta] = None,
+        session_id: Optional[str] = None,
     ) -> str:
         if expires_delta:
             expire = datetime.now(timezone.utc) + expires_delta
@@ -56,35 +68,104 @@ class TokenService:
             "email": email,
             "exp": expire,
             "iat": datetime.now(timezone.utc),
+            "jti": uuid4().hex,
             "type": "refresh",
         }
+        if session_id:
+            payload["sid"] = session_id
 
         return jwt.encode(payload, self.secret, algorithm=self.algorithm)
 
     def verify_token(self, token: str) -> dict:
         try:
-            payload = jwt.decode(
+            payload = verified_payload(
                 token,
-                self.secret,
-                algorithms=[self.algorithm],
-                options={"verify_exp": True},
+                lambda: jwt.decode(
+                    token,
+                    self.secret,
+                    algorithms=[self.algorithm],
+                    options={"verify_exp": True},
+                ),
             )
-            return payload
         except jwt.ExpiredSignatureError:
             raise ValueError("Token has expired")
         except jwt.InvalidTokenError:
             raise ValueError("Invalid token")
+        if revocation_store.is_revoked(
+            payload.get("jti"), int(payload["sub"]), payload.get("iat", 0)
+        ):
+            raise ValueError("Token has been revoked")
+        return payload
+
+    async def revoke_token(
+        self, token: str, user_id: Optional[int] = None
+    ) -> Optional[dict]:
+        try:
+            payload = self.verify_token(token)
+        except (ValueError, KeyError):
+            return None
+        if user_id is not None and payload.get("sub") != str(user_id):
+            return None
+        if payload.get("jti"):
+            await revocation_store.revoke_token(
+                payload["jti"],
+                datetime.fromtimestamp(payload["exp"], tz=timezone.utc),
+            )
+        if payload.get("type") == "refresh" and payload.get("sid"):
+            await self.session.execute(
+                delete(auth_session).where(auth_session.c.id == payload["sid"])
+            )
+            await self.session.commit()
+        return payload
+
+    async def start_session(self, user_id: int, email: str) -> str:
+        session_id = uuid4().hex
+        expires_at = datetime.now(timezone.utc) + timedelta(
+            days=config.auth.refresh_token_expire_days
+        )
+        refresh_token = self.create_refresh_token(
+            user_id, email, session_id=session_id
+        )
+        await self.session.execute(
+            insert(auth_session).values(
+                id=session_id,
+                user_id=user_id,
+                token_hash=hash_refresh_token(refresh_token),
+                expires_at=expires_at,
+            )
+        )
+        await self.session.commit()
+        return refresh_token
 
     async def authenticate_user(self, email: str, password: str) -> Optional[User]:
-        from src.utils.password import verify_password
+        from src.utils.password import verify_and_rehash_async
 
         user = await self.user_service.get_by_email(email)
         if not user:
             return None
-        if not verify_password(password, user.password_hash):
+        valid, new_hash = await verify_and_rehash_async(password, user.password_hash)
+        if not valid:
             return None
+        if new_hash is not None:
+            await self._upgrade_password_hash(user, new_hash)
         return user
 
+    async def _upgrade_password_hash(self, user: User, new_hash: str) -> None:
+        # Only replace the exact hash we verified, so a concurrent password
+        # change is never overwritten by a login with the old password.
+        try:
+            await self.session.execute(
+                update(User)
+                .where(User.id == user.id, User.password_hash == user.password_hash)
+                .values(password_hash=new_hash)
+                .execution_options(synchronize_session=False)
+            )
+            await self.session.commit()
+            user_cache.invalidate(user.id)
+        except Exception as e:
+            await self.session.rollback()
+            logger.warning(f"Password rehash for user {user.id} failed: {e}")
+
     async def refresh_access_token(self, refresh_token: str) -> Optional[dict]:
         try:
             payload = self.verify_token(refresh_token)
@@ -93,16 +174,38 @@ class TokenService:
 
             user_id = int(payload["sub"])
             email = payload["email"]
+            session_id = payload["sid"]
+            token_hash = hash_refresh_token(refresh_token)
 
-            user = await self.user_service.get_by_id(user_id)
-            if not user:
+            expires_at = datetime.now(timezone.utc) + timedelta(
+                days=config.auth.refresh_token_expire_days
+            )
+            new_refresh_token = self.create_refresh_token(
+                user_id, email, session_id=session_id
+            )
+            result = await self.session.execute(
+                update(auth_session)
+                .where(
+                    auth_session.c.id == session_id,
+                    auth_session.c.token_hash == token_hash,
+                    auth_session.c.expires_at > func.now(),
+                )
+                .values(
+                    token_hash=hash_refresh_token(new_refresh_token),
+                    expires_at=expires_at,
+                )
+                .returning(auth_session.c.user_id)
+            )
+            if result.scalar_one_or_none() is None:
+                await self._end_session(session_id, user_id, token_hash)
                 return None
+            await self.session.commit()
 
             new_access_token = self.create_access_token(user_id, email)
 
             return {
                 "access_token": new_access_token,
-                "refresh_token": refresh_token,
+                "refresh_token": new_refresh_token,
                 "token_type": "bearer",
                 "user_id": user_id,
                 "email": email,
@@ -110,6 +213,22 @@ class TokenService:
         except (ValueError, KeyError, jwt.PyJWTError):
             return None
 
+    async def _end_session(
+        self, session_id: str, user_id: int, token_hash: str
+    ) -> None:
+        # A validly signed refresh token that no longer matches its session
+        # was already rotated: treat it as stolen and end the whole session.
+        result = await self.session.execute(
+            delete(auth_session)
+            .where(auth_session.c.id == session_id)
+            .returning(auth_session.c.token_hash)
+        )
+        stored_hash = result.scalar_one_or_none()
+        await self.session.commit()
+        if stored_hash is not None and stored_hash != token_hash:
+            logger.warning(f"Refresh token reuse detected for user {user_id}")
+            await revocation_store.revoke_user(user_id)
+
 
 async def provide_token_service(
     db_session: AsyncSession,
@@ -0,0 +1,66 @@
+import asyncio
+import hashlib
+import logging
+
+from sqlalchemy import delete, func, select
+
+from src.account.models.tokens import AuthSession
+from src.core.config import config
+from src.core.database import engine
+
+logger = logging.getLogger(__name__)
+
+auth_session = AuthSession.__table__
+
+
+def hash_refresh_token(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+async def purge_expired_sessions(batch_size: int) -> int:
+    """Delete expired sessions in batches of ``batch_size``; return the count."""
+    expired = (
+        select(auth_session.c.id)
+        .where(auth_session.c.expires_at < func.now())
+        .order_by(auth_session.c.expires_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    stmt = delete(auth_session).where(auth_session.c.id.in_(expired))
+    total = 0
+    while True:
+        async with engine.begin() as connection:
+            result = await connection.execute(stmt)
+        total += result.rowcount
+        if result.rowcount < batch_size:
+            return total
+        await asyncio.sleep(config.auth.session_purge_pause)
+
+
+class SessionPurger:
+    def __init__(self):
+        self._task: asyncio.Task | None = None
+
+    async def _run_forever(self) -> None:
+        while True:
+            await asyncio.sleep(config.auth.session_purge_interval)
+            try:
+                purged = await purge_expired_sessions(
+                    config.auth.session_purge_batch_size
+                )
+                if purged:
+                    logger.info(f"Purged {purged} expired auth sessions")
+            except Exception as e:
+                logger.error(f"Auth session purge failed: {e}")
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+session_purger = SessionPurger()
@@ -0,0 +1,118 @@
+import ipaddress
+import math
+import time
+from collections import OrderedDict
+from typing import Hashable
+
+from src.core.config import config
+from src.core.metrics import login_throttled
+
+
+class SlidingWindowLimiter:
+    """Approximate sliding-window counter per key with bounded memory.
+
+    Each key keeps the counts of the current and previous fixed windows; the
+    previous count is weighted by how much of it still overlaps the sliding
+    window. The least recently used keys are evicted past ``max_keys``.
+    """
+
+    def __init__(self, limit: int, window: float, max_keys: int):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self._entries: OrderedDict[Hashable, tuple[float, int, int]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def hit(self, key: Hashable) -> float:
+        """Count an attempt. Returns 0 if allowed, else seconds to wait."""
+        now = time.monotonic()
+        start = now - now % self.window
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < start - self.window:
+            previous, current = 0, 0
+        elif entry[0] < start:
+            previous, current = entry[2], 0
+        else:
+            previous, current = entry[1], entry[2]
+
+        overlap = 1 - (now - start) / self.window
+        if previous * overlap + current >= self.limit:
+            return start + self.window - now
+        self._entries[key] = (start, previous, current + 1)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_keys:
+            self._entries.popitem(last=False)
+        return 0.0
+
+    def reset(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+
+_trusted_proxies = tuple(
+    ipaddress.ip_network(proxy, strict=False) for proxy in config.auth.trusted_proxies
+)
+
+
+def _is_trusted_proxy(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in _trusted_proxies)
+
+
+def resolve_client_ip(peer: str, forwarded_for: str | None) -> str:
+    """Return the client IP, looking through X-Forwarded-For set by trusted proxies.
+
+    Hops are read right to left and the first one that is not a trusted proxy
+    is the client; anything further left was supplied by the client itself.
+    """
+    if not forwarded_for or not _is_trusted_proxy(peer):
+        return peer
+    hops = [hop.strip() for hop in forwarded_for.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted_proxy(hop):
+            return hop
+    return hops[0] if hops else peer
+
+
+class LoginThrottle:
+    """Rejects login bursts per client IP and per email before any hashing.
+
+    A limit of 0 disables that dimension.
+    """
+
+    def __init__(self):
+        settings = config.auth
+        self.by_ip = SlidingWindowLimiter(
+            settings.login_ip_limit,
+            settings.login_window,
+            settings.login_throttle_max_keys,
+        )
+        self.by_email = SlidingWindowLimiter(
+            settings.login_email_limit,
+            settings.login_window,
+            settings.login_throttle_max_keys,
+        )
+
+    def check(self, ip: str, email: str) -> int | None:
+        """Record an attempt; return Retry-After seconds if it is rejected."""
+        for name, limiter, key in (
+            ("ip", self.by_ip, ip),
+            ("email", self.by_email, email.strip().lower()),
+        ):
+            if limiter.limit <= 0:
+                continue
+            wait = limiter.hit(key)
+            if wait:
+                login_throttled.inc(key=name)
+                return max(1, math.ceil(wait))
+        return None
+
+    def succeeded(self, email: str) -> None:
+        self.by_email.reset(email.strip().lower())
+
+
+login_throttle = LoginThrottle()
@@ -0,0 +1,60 @@
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Sequence
+
+from litestar.security.jwt import Token
+
+from src.core.config import config
+from src.core.metrics import register_cache
+from src.utils.cache import TTLCache
+
+# Every token is verified with the same secret and algorithm, so the digest
+# of the encoded token is enough to identify a verified payload.
+token_cache = TTLCache(
+    maxsize=config.auth.token_cache_size,
+    ttl=config.auth.refresh_token_expire_days * 86400,
+)
+register_cache("token", token_cache)
+
+
+def verified_payload(
+    encoded_token: str, decode: Callable[[], dict[str, Any]]
+) -> dict[str, Any]:
+    """Return the payload of ``encoded_token``, calling ``decode`` on a miss.
+
+    Entries expire together with the token's ``exp`` claim. Revocation is not
+    cached: callers still check the revocation store on every use.
+    """
+    key = hashlib.sha256(encoded_token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is None:
+        payload = decode()
+        expires_in = payload.get("exp", 0) - time.time()
+        if expires_in > 0:
+            token_cache.set(key, payload, ttl=expires_in)
+    # Callers mutate what they get back (Token.decode moves claims around).
+    payload = dict(payload)
+    if isinstance(payload.get("extras"), dict):
+        payload["extras"] = dict(payload["extras"])
+    return payload
+
+
+@dataclass
+class CachedToken(Token):
+    @classmethod
+    def decode_payload(
+        cls,
+        encoded_token: str,
+        secret: str,
+        algorithms: list[str],
+        issuer: Optional[list[str]] = None,
+        audience: Optional[str | Sequence[str]] = None,
+        options: Optional[Any] = None,
+    ) -> Any:
+        return verified_payload(
+            encoded_token,
+            lambda: super(CachedToken, cls).decode_payload(
+                encoded_token, secret, algorithms, issuer, audience, options
+            ),
+        )
@@ -1,5 +1,5 @@
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from dotenv import load_dotenv
 
@@ -14,6 +14,28 @@ class DatabaseConfig:
     pool_size: int = int(os.getenv("DB_POOL_SIZE", "20"))
     max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "40"))
     echo: bool = os.getenv("DB_ECHO", "false").lower() == "true"
+    pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    pool_pre_ping: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    statement_cache_size: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+    prepared_statement_cache_size: int = int(
+        os.getenv("DB_PREPARED_STATEMENT_CACHE_SIZE", "100")
+    )
+    pgbouncer: bool = os.getenv("DB_PGBOUNCER", "false").lower() == "true"
+    replica_urls: tuple[str, ...] = tuple(
+        url.strip()
+        for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+        if url.strip()
+    )
+    replica_health_interval: float = float(
+        os.getenv("DB_REPLICA_HEALTH_INTERVAL", "5")
+    )
+    replica_health_timeout: float = float(os.getenv("DB_REPLICA_HEALTH_TIMEOUT", "2"))
+    # How long after writing a user this worker keeps reading it from the
+    # primary; set it above the replicas' usual replication lag.
+    replica_read_after_write: float = float(
+        os.getenv("DB_REPLICA_READ_AFTER_WRITE", "5")
+    )
 
 
 @dataclass
@@ -29,6 +51,63 @@ class AuthConfig:
     require_email_verification: bool = (
         os.getenv("REQUIRE_EMAIL_VERIFICATION", "false").lower() == "true"
     )
+    user_cache_size: int = int(os.getenv("USER_CACHE_SIZE", "10000"))
+    user_cache_ttl: float = float(os.getenv("USER_CACHE_TTL", "60"))
+    token_cache_size: int = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+    stateless: bool = os.getenv("AUTH_STATELESS", "false").lower() == "true"
+    revocation_sync_interval: float = float(
+        os.getenv("REVOCATION_SYNC_INTERVAL", "5")
+    )
+    revocation_purge_interval: float = float(
+        os.getenv("REVOCATION_PURGE_INTERVAL", "3600")
+    )
+    session_purge_interval: float = float(os.getenv("SESSION_PURGE_INTERVAL", "300"))
+    session_purge_batch_size: int = int(os.getenv("SESSION_PURGE_BATCH_SIZE", "1000"))
+    session_purge_pause: float = float(os.getenv("SESSION_PURGE_PAUSE", "0.1"))
+    login_window: float = float(os.getenv("LOGIN_THROTTLE_WINDOW", "60"))
+    login_ip_limit: int = int(os.getenv("LOGIN_THROTTLE_IP_LIMIT", "30"))
+    login_email_limit: int = int(os.getenv("LOGIN_THROTTLE_EMAIL_LIMIT", "5"))
+    login_throttle_max_keys: int = int(
+        os.getenv("LOGIN_THROTTLE_MAX_KEYS", "100000")
+    )
+    # Peers (IPs or CIDRs) whose X-Forwarded-For is trusted when resolving the
+    # client IP, e.g. the load balancer. Empty means the socket peer is used.
+    trusted_proxies: tuple[str, ...] = tuple(
+        proxy.strip()
+        for proxy in os.getenv("TRUSTED_PROXIES", "").split(",")
+        if proxy.strip()
+    )
+
+
+@dataclass
+class PasswordHashingConfig:
+    executor: str = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")
+    max_workers: int = int(
+        os.getenv("PASSWORD_HASH_MAX_WORKERS", str(min(4, os.cpu_count() or 1)))
+    )
+    max_queue: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "64"))
+    retry_after: int = int(os.getenv("PASSWORD_HASH_RETRY_AFTER", "1"))
+    # Per web worker: the login pool is max_workers threads, or max_workers
+    # processes with executor=process. Bulk imports in a web worker share that
+    # pool and hold at most bulk_slots of it (capped at max_workers - 1), so
+    # they add no processes; with max_workers < 2 the /users/bulk endpoint is
+    # disabled. Only the bulk CLI spawns bulk_workers processes.
+    bulk_slots: int = int(os.getenv("PASSWORD_HASH_BULK_SLOTS", "0")) or max(
+        1, max_workers // 2
+    )
+    bulk_workers: int = int(
+        os.getenv("PASSWORD_HASH_BULK_WORKERS", str(os.cpu_count() or 1))
+    )
+    scheme: str = os.getenv("PASSWORD_HASH_SCHEME", "argon2id")
+    target_ms: float = float(os.getenv("PASSWORD_HASH_TARGET_MS", "250"))
+    pbkdf2_iterations: int = int(
+        os.getenv("PASSWORD_HASH_PBKDF2_ITERATIONS", "600000")
+    )
+    argon2_time_cost: int = int(os.getenv("PASSWORD_HASH_ARGON2_TIME_COST", "3"))
+    argon2_memory_cost: int = int(
+        os.getenv("PASSWORD_HASH_ARGON2_MEMORY_COST", "65536")
+    )
+    argon2_parallelism: int = int(os.getenv("PASSWORD_HASH_ARGON2_PARALLELISM", "1"))
 
 
 @dataclass
@@ -36,17 +115,135 @@ class AppConfig:
     debug: bool = os.getenv("DEBUG", "false").lower() == "true"
     host: str = os.getenv("HOST", "0.0.0.0")
     port: int = int(os.getenv("PORT", "8000"))
+    page_size_default: int = int(os.getenv("PAGE_SIZE_DEFAULT", "100"))
+    page_size_max: int = int(os.getenv("PAGE_SIZE_MAX", "1000"))
+    stream_chunk_size: int = int(os.getenv("STREAM_CHUNK_SIZE", "500"))
+    bulk_import_batch_size: int = int(os.getenv("BULK_IMPORT_BATCH_SIZE", "1000"))
+    bulk_report_spool_bytes: int = int(
+        os.getenv("BULK_REPORT_SPOOL_BYTES", str(4 * 1024 * 1024))
+    )
+    openapi_prebuilt_path: str = os.getenv("OPENAPI_PREBUILT_PATH", "")
+    user_loader_window_ms: float = float(os.getenv("USER_LOADER_WINDOW_MS", "0"))
+    user_loader_max_batch: int = int(os.getenv("USER_LOADER_MAX_BATCH", "100"))
+    batch_get_max_ids: int = int(os.getenv("BATCH_GET_MAX_IDS", "500"))
+    user_soft_delete: bool = os.getenv("USER_SOFT_DELETE", "false").lower() == "true"
+    user_purge_interval: float = float(os.getenv("USER_PURGE_INTERVAL", "60"))
+    user_purge_batch_size: int = int(os.getenv("USER_PURGE_BATCH_SIZE", "1000"))
+    user_purge_pause: float = float(os.getenv("USER_PURGE_PAUSE", "0.1"))
+    log_level: str = os.getenv("LOG_LEVEL", "INFO").upper()
+    log_format: str = os.getenv("LOG_FORMAT", "json")
+    log_queue_size: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    log_sample_burst: int = int(os.getenv("LOG_SAMPLE_BURST", "10"))
+    log_sample_window: float = float(os.getenv("LOG_SAMPLE_WINDOW", "60"))
+    log_sample_rate: int = int(os.getenv("LOG_SAMPLE_RATE", "100"))
+
+
+@dataclass
+class OAuthProviderConfig:
+    token_url: str
+    client_id: str
+    client_secret: str
+    concurrency: int
+
+
+def _oauth_providers() -> dict[str, OAuthProviderConfig]:
+    providers = {}
+    for name in os.getenv("OAUTH_PROVIDERS", "").split(","):
+        name = name.strip()
+        if not name:
+            continue
+        prefix = f"OAUTH_{name.upper()}_"
+        providers[name] = OAuthProviderConfig(
+            token_url=os.getenv(prefix + "TOKEN_URL", ""),
+            client_id=os.getenv(prefix + "CLIENT_ID", ""),
+            client_secret=os.getenv(prefix + "CLIENT_SECRET", ""),
+            concurrency=int(os.getenv(prefix + "CONCURRENCY", "10")),
+        )
+    return providers
+
+
+@dataclass
+class OAuthConfig:
+    providers: dict[str, OAuthProviderConfig] = field(
+        default_factory=_oauth_providers
+    )
+    refresh_interval: float = float(os.getenv("OAUTH_REFRESH_INTERVAL", "60"))
+    refresh_lead: int = int(os.getenv("OAUTH_REFRESH_LEAD", "300"))
+    refresh_batch_size: int = int(os.getenv("OAUTH_REFRESH_BATCH_SIZE", "200"))
+    refresh_timeout: float = float(os.getenv("OAUTH_REFRESH_TIMEOUT", "10"))
+    # How long a claimed account is hidden from other workers; keep it well
+    # above the HTTP timeout. Failed accounts are retried once it lapses.
+    refresh_lease: int = int(os.getenv("OAUTH_REFRESH_LEASE", "120"))
+    refresh_max_connections: int = int(
+        os.getenv("OAUTH_REFRESH_MAX_CONNECTIONS", "50")
+    )
+
+
+def _route_priorities() -> tuple[tuple[str, int], ...]:
+    routes = os.getenv(
+        "LIMITER_ROUTE_PRIORITIES",
+        "/auth/refresh=0,/auth/logout=0,/auth/register=3,/users/bulk=3",
+    )
+    pairs = [item.split("=", 1) for item in routes.split(",") if "=" in item]
+    # Longest prefix first so the most specific route wins.
+    return tuple(
+        sorted(
+            ((path.strip(), int(priority)) for path, priority in pairs),
+            key=lambda pair: len(pair[0]),
+            reverse=True,
+        )
+    )
+
+
+@dataclass
+class LimiterConfig:
+    enabled: bool = os.getenv("LIMITER_ENABLED", "true").lower() == "true"
+    initial_limit: int = int(os.getenv("LIMITER_INITIAL_LIMIT", "40"))
+    min_limit: int = int(os.getenv("LIMITER_MIN_LIMIT", "4"))
+    max_limit: int = int(os.getenv("LIMITER_MAX_LIMIT", "400"))
+    # A response slower than tolerance x its route's baseline latency counts
+    # as a congestion signal.
+    tolerance: float = float(os.getenv("LIMITER_TOLERANCE", "2"))
+    backoff: float = float(os.getenv("LIMITER_BACKOFF", "0.9"))
+    max_queue: int = int(os.getenv("LIMITER_MAX_QUEUE", "200"))
+    queue_timeout: float = float(os.getenv("LIMITER_QUEUE_TIMEOUT", "1"))
+    retry_after: int = int(os.getenv("LIMITER_RETRY_AFTER", "1"))
+    exempt_paths: tuple[str, ...] = tuple(
+        path.strip()
+        for path in os.getenv(
+            "LIMITER_EXEMPT_PATHS", "/health,/metrics,/schema,/users/stream"
+        ).split(",")
+        if path.strip()
+    )
+    route_priorities: tuple[tuple[str, int], ...] = field(
+        default_factory=_route_priorities
+    )
+
+    def __post_init__(self):
+        if not 1 <= self.min_limit <= self.initial_limit <= self.max_limit:
+            raise ValueError(
+                "Expected 1 <= LIMITER_MIN_LIMIT <= LIMITER_INITIAL_LIMIT"
+                " <= LIMITER_MAX_LIMIT"
+            )
+        if self.max_queue < 0:
+            raise ValueError("LIMITER_MAX_QUEUE must not be negative")
 
 
 @dataclass
 class Config:
     database: DatabaseConfig
     auth: AuthConfig
+    password_hashing: PasswordHashingConfig
+    oauth: OAuthConfig
+    limiter: LimiterConfig
     app: AppConfig
 
     def __init__(self):
         self.database = DatabaseConfig()
         self.auth = AuthConfig()
+        self.password_hashing = PasswordHashingConfig()
+        self.oauth = OAuthConfig()
+        self.limiter = LimiterConfig()
         self.app = AppConfig()
 
 
@@ -0,0 +1,35 @@
+from typing import Any
+
+from litestar import Controller, Response, get
+
+from src.core.database import get_pool_stats, replica_router
+from src.core.metrics import registry
+
+
+class HealthController(Controller):
+    tags = ["Health"]
+    path = "/health"
+
+    @get("/")
+    async def health(self) -> dict[str, str]:
+        return {"status": "ok"}
+
+    @get("/db")
+    async def database_pool(self) -> dict[str, Any]:
+        stats = get_pool_stats()
+        stats["replicas"] = [
+            {**entry, "pool": get_pool_stats(replica_router.engines[entry["index"]])}
+            for entry in replica_router.status()
+        ]
+        return stats
+
+
+class MetricsController(Controller):
+    tags = ["Health"]
+    path = "/metrics"
+
+    @get("/", include_in_schema=False)
+    async def metrics(self) -> Response[str]:
+        return Response(
+            registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+        )
@@ -0,0 +1,259 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Sequence
+from uuid import uuid4
+
+from sqlalchemy import text
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.core.config import DatabaseConfig, config
+from src.core.metrics import db_pool_wait, instrument_engine, registry
+
+logger = logging.getLogger(__name__)
+
+
+class PoolWaitStats:
+    def __init__(self):
+        self.acquisitions = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record(self, elapsed: float, timed_out: bool = False) -> None:
+        db_pool_wait.observe(elapsed)
+        if timed_out:
+            self.timeouts += 1
+        else:
+            self.acquisitions += 1
+        self.wait_seconds_total += elapsed
+        self.wait_seconds_max = max(self.wait_seconds_max, elapsed)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long callers wait for a connection."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.wait_stats.record(time.perf_counter() - started, timed_out=True)
+            raise
+        self.wait_stats.record(time.perf_counter() - started)
+        return connection
+
+
+def _connect_args(settings: DatabaseConfig) -> dict[str, Any]:
+    connect_args: dict[str, Any] = {
+        "statement_cache_size": settings.statement_cache_size,
+        "prepared_statement_cache_size": settings.prepared_statement_cache_size,
+    }
+    if settings.pgbouncer:
+        # Server connections are shared between clients, so prepared
+        # statement names must be globally unique: asyncpg's own cache is
+        # turned off and SQLAlchemy's cache names statements by uuid. This
+        # needs pgbouncer >= 1.21 with max_prepared_statements > 0; on older
+        # versions also set DB_PREPARED_STATEMENT_CACHE_SIZE=0.
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = _prepared_statement_name
+    return connect_args
+
+
+def _prepared_statement_name() -> str:
+    return f"__asyncpg_{uuid4()}__"
+
+
+def create_engine(
+    settings: DatabaseConfig | None = None, url: str | None = None
+) -> AsyncEngine:
+    settings = settings or config.database
+    return create_async_engine(
+        url or settings.url,
+        echo=settings.echo,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.pool_size,
+        max_overflow=settings.max_overflow,
+        pool_timeout=settings.pool_timeout,
+        pool_recycle=settings.pool_recycle,
+        pool_pre_ping=settings.pool_pre_ping,
+        connect_args=_connect_args(settings),
+    )
+
+
+engine = create_engine()
+instrument_engine(engine)
+async_session_factory = async_sessionmaker(
+    engine, expire_on_commit=False, class_=AsyncSession
+)
+
+
+class ReplicaRouter:
+    """Round-robin over healthy read replicas, falling back to the primary.
+
+    A background task pings every replica and takes failing ones out of
+    rotation until they answer again. A replica that fails a query with a
+    connection error is dropped immediately.
+    """
+
+    _connection_errors = (OperationalError, InterfaceError, OSError, TimeoutError)
+
+    def __init__(self, urls: Sequence[str]):
+        self.urls = list(urls)
+        self.engines = [create_engine(url=url) for url in self.urls]
+        for replica in self.engines:
+            instrument_engine(replica)
+        self._session_factories = [
+            async_sessionmaker(replica, expire_on_commit=False, class_=AsyncSession)
+            for replica in self.engines
+        ]
+        self._healthy = list(range(len(self.engines)))
+        self._next = 0
+        self._task: asyncio.Task | None = None
+
+    def _pick(self) -> int | None:
+        if not self._healthy:
+            return None
+        index = self._healthy[self._next % len(self._healthy)]
+        self._next += 1
+        return index
+
+    def mark_down(self, index: int, error: BaseException) -> None:
+        if index in self._healthy:
+            self._healthy.remove(index)
+            logger.warning(f"Replica {index} removed from rotation: {error}")
+
+    def mark_up(self, index: int) -> None:
+        if index not in self._healthy:
+            self._healthy.append(index)
+            self._healthy.sort()
+            logger.info(f"Replica {index} back in rotation")
+
+    @asynccontextmanager
+    async def read_session(self) -> AsyncIterator[AsyncSession | None]:
+        """Yield a session on a healthy replica, or None if there is none.
+
+        Connection errors inside the block mark the replica down and are
+        swallowed, so the caller continues after the block on the primary.
+        """
+        index = self._pick()
+        if index is None:
+            yield None
+            return
+        try:
+            async with self._session_factories[index]() as session:
+                yield session
+        except self._connection_errors as e:
+            self.mark_down(index, e)
+
+    @asynccontextmanager
+    async def read_connection(self) -> AsyncIterator[AsyncConnection]:
+        """Borrow a pooled connection for Core reads, from a replica if healthy.
+
+        A replica that cannot hand out a connection is marked down and the
+        primary is used instead.
+        """
+        index = self._pick()
+        if index is not None:
+            try:
+                connection = await self.engines[index].connect()
+            except self._connection_errors as e:
+                self.mark_down(index, e)
+            else:
+                try:
+                    yield connection
+                finally:
+                    await connection.close()
+                return
+        async with engine.connect() as connection:
+            yield connection
+
+    async def check(self) -> None:
+        timeout = config.database.replica_health_timeout
+        for index, replica in enumerate(self.engines):
+            try:
+                async with asyncio.timeout(timeout):
+                    async with replica.connect() as connection:
+                        await connection.execute(text("SELECT 1"))
+            except Exception as e:
+                self.mark_down(index, e)
+            else:
+                self.mark_up(index)
+
+    def status(self) -> list[dict[str, Any]]:
+        return [
+            {"index": index, "healthy": index in self._healthy}
+            for index in range(len(self.engines))
+        ]
+
+    async def _check_forever(self) -> None:
+        while True:
+            await asyncio.sleep(config.database.replica_health_interval)
+            await self.check()
+
+    async def start(self) -> None:
+        if not self.engines:
+            return
+        await self.check()
+        self._task = asyncio.create_task(self._check_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for replica in self.engines:
+            await replica.dispose()
+
+
+replica_router = ReplicaRouter(config.database.replica_urls)
+
+
+def get_pool_stats(db_engine: AsyncEngine | None = None) -> dict[str, Any]:
+    pool = (db_engine or engine).pool
+    stats: dict[str, Any] = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+    wait_stats = getattr(pool, "wait_stats", None)
+    if wait_stats is not None:
+        stats.update(
+            acquisitions=wait_stats.acquisitions,
+            timeouts=wait_stats.timeouts,
+            wait_seconds_total=wait_stats.wait_seconds_total,
+            wait_seconds_max=wait_stats.wait_seconds_max,
+        )
+    return stats
+
+
+def _collect_pool_metrics():
+    stats = get_pool_stats()
+    for name, key, metric_type in (
+        ("db_pool_size", "size", "gauge"),
+        ("db_pool_checked_out", "checked_out", "gauge"),
+        ("db_pool_overflow", "overflow", "gauge"),
+        ("db_pool_timeouts_total", "timeouts", "counter"),
+    ):
+        yield name, metric_type, f"Connection pool {key}", [({}, stats[key])]
+    yield "db_replica_healthy", "gauge", "Read replica in rotation", [
+        ({"replica": entry["index"]}, int(entry["healthy"]))
+        for entry in replica_router.status()
+    ]
+
+
+registry.add_collector(_collect_pool_metrics)
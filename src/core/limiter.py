@@ -0,0 +1,240 @@
+"""Per-worker adaptive concurrency limit with prioritized load shedding.
+
+Requests over the limit wait in a priority queue for at most
+``LIMITER_QUEUE_TIMEOUT`` seconds; when the queue is full a request either
+evicts a lower-priority waiter or is rejected at once with 503 and
+Retry-After. The limit follows AIMD on a latency gradient: each route keeps
+its own baseline latency, and the limit backs off multiplicatively when a
+response takes more than ``LIMITER_TOLERANCE`` times that baseline. It grows
+by about one per window of fast completions while it is saturated. Routes
+that are slow by design are thus judged against themselves, and low-priority
+traffic does not move the limit at all.
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import time
+from collections import OrderedDict
+
+from litestar.status_codes import HTTP_503_SERVICE_UNAVAILABLE
+from litestar.types import ASGIApp, Receive, Scope, Send
+
+from src.core.config import config
+from src.core.metrics import http_requests_shed, registry
+
+HIGH_PRIORITY = 0
+AUTHENTICATED_READ_PRIORITY = 1
+DEFAULT_PRIORITY = 2
+
+MAX_TRACKED_ROUTES = 1000
+# Baselines follow slower latencies only gradually, so sustained congestion
+# is not mistaken for the new normal within a few requests.
+BASELINE_DRIFT = 0.01
+
+
+class AdaptiveLimiter:
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        tolerance: float,
+        backoff: float,
+        max_queue: int,
+        queue_timeout: float,
+    ):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._last_decrease = 0.0
+        self._baselines: OrderedDict[str, float] = OrderedDict()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, priority: int) -> str | None:
+        """Take a slot; return None once admitted, else why it was shed."""
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return None
+
+        if len(self._waiters) >= self.max_queue:
+            # A waiter whose timeout or cancellation has fired leaves the
+            # queue only once its task runs again; its place is free now.
+            self._waiters = [entry for entry in self._waiters if not entry[2].done()]
+            heapq.heapify(self._waiters)
+        if len(self._waiters) >= self.max_queue:
+            if not self._waiters:
+                return "queue_full"
+            worst = max(self._waiters)
+            if worst[0] <= priority:
+                return "queue_full"
+            self._waiters.remove(worst)
+            heapq.heapify(self._waiters)
+            worst[2].set_result(False)
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (priority, next(self._sequence), future)
+        heapq.heappush(self._waiters, entry)
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                admitted = await future
+        except BaseException as e:
+            if entry in self._waiters:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+            elif future.done() and not future.cancelled() and future.result():
+                # Granted just as the deadline hit: hand the slot on.
+                self.release()
+            if isinstance(e, TimeoutError):
+                return "timeout"
+            raise
+        return None if admitted else "evicted"
+
+    def release(self, route: str | None = None, latency: float = 0.0) -> None:
+        """Free a slot; pass ``route`` to let its latency adapt the limit."""
+        self.in_flight -= 1
+        if route is not None:
+            self._adjust(route, latency)
+        while self._waiters and self.in_flight < int(self.limit):
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self.in_flight += 1
+            future.set_result(True)
+
+    def _baseline(self, route: str, latency: float) -> float | None:
+        """Return the route's baseline before folding ``latency`` into it."""
+        baseline = self._baselines.get(route)
+        if baseline is None or latency < baseline:
+            self._baselines[route] = latency
+        else:
+            self._baselines[route] = baseline + (latency - baseline) * BASELINE_DRIFT
+        self._baselines.move_to_end(route)
+        while len(self._baselines) > MAX_TRACKED_ROUTES:
+            self._baselines.popitem(last=False)
+        return baseline
+
+    def _adjust(self, route: str, latency: float) -> None:
+        baseline = self._baseline(route, latency)
+        if baseline is None:
+            return
+        if latency > baseline * self.tolerance:
+            # One decrease per slow response time, so a burst of slow
+            # responses that started under the old limit does not collapse it.
+            now = time.monotonic()
+            if now - self._last_decrease >= latency:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                self._last_decrease = now
+        elif self._waiters or self.in_flight + 1 >= int(self.limit):
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+
+limiter = AdaptiveLimiter(
+    initial_limit=config.limiter.initial_limit,
+    min_limit=config.limiter.min_limit,
+    max_limit=config.limiter.max_limit,
+    tolerance=config.limiter.tolerance,
+    backoff=config.limiter.backoff,
+    max_queue=config.limiter.max_queue,
+    queue_timeout=config.limiter.queue_timeout,
+)
+
+
+def _collect():
+    yield "http_concurrency_limit", "gauge", "Adaptive in-flight request limit", [
+        ({}, limiter.limit)
+    ]
+    yield "http_requests_in_flight", "gauge", "Requests holding a limiter slot", [
+        ({}, limiter.in_flight)
+    ]
+    yield "http_requests_queued", "gauge", "Requests waiting for a limiter slot", [
+        ({}, limiter.queued)
+    ]
+
+
+registry.add_collector(_collect)
+
+
+def route_priority(scope: Scope) -> int:
+    """Lower runs first.
+
+    Configured routes take their own priority. Reads carrying an
+    Authorization header come next; the token is not verified yet, so they
+    never rank with the configured high-priority routes.
+    """
+    path = scope["path"]
+    for prefix, priority in config.limiter.route_priorities:
+        if path.startswith(prefix):
+            return priority
+    if scope["method"] in ("GET", "HEAD") and any(
+        name == b"authorization" for name, _ in scope["headers"]
+    ):
+        return AUTHENTICATED_READ_PRIORITY
+    return DEFAULT_PRIORITY
+
+
+def route_key(scope: Scope) -> str:
+    """Method and path with numeric segments collapsed, e.g. GET /users/{id}."""
+    segments = ("{id}" if part.isdigit() else part for part in scope["path"].split("/"))
+    return f"{scope['method']} {'/'.join(segments)}"
+
+
+_OVERLOADED_BODY = json.dumps(
+    {"status_code": HTTP_503_SERVICE_UNAVAILABLE, "detail": "Server is overloaded"}
+).encode()
+
+
+class ConcurrencyLimitMiddleware:
+    """Admit requests through ``limiter``; shed the rest with a fast 503."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not config.limiter.enabled
+            or scope["path"].startswith(config.limiter.exempt_paths)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        priority = route_priority(scope)
+        rejected = await limiter.acquire(priority)
+        if rejected is not None:
+            http_requests_shed.inc(reason=rejected, priority=priority)
+            await self._overloaded(send)
+            return
+
+        # Low-priority routes are admitted through the limit but do not adapt it.
+        route = route_key(scope) if priority <= DEFAULT_PRIORITY else None
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(route, time.perf_counter() - started)
+
+    async def _overloaded(self, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": HTTP_503_SERVICE_UNAVAILABLE,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(_OVERLOADED_BODY)).encode()),
+                    (b"retry-after", str(config.limiter.retry_after).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": _OVERLOADED_BODY})
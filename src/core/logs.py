@@ -0,0 +1,179 @@
+"""Queue-backed, sampled logging.
+
+Callers only enqueue the record. A QueueListener thread renders it with
+structlog, including any traceback, and writes it to stdout. Each call site
+may log ``LOG_SAMPLE_BURST`` records per window; after that only one in
+``LOG_SAMPLE_RATE`` gets through, carrying the number it stands in for.
+"""
+
+import copy
+import logging
+import queue
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Hashable
+
+import structlog
+
+from src.core.config import config
+from src.core.metrics import log_events_dropped
+
+MAX_SAMPLED_SITES = 10000
+
+
+class LogSampler:
+    """Per-key fixed window: ``burst`` records, then one in ``rate``."""
+
+    def __init__(self, burst: int, window: float, rate: int):
+        self.burst = burst
+        self.window = window
+        self.rate = max(rate, 1)
+        self._lock = threading.Lock()
+        # key -> [window start, records seen in window, suppressed since last]
+        self._sites: OrderedDict[Hashable, list] = OrderedDict()
+
+    def allow(self, key: Hashable) -> int | None:
+        """Return None to drop the record, else how many it stands in for."""
+        now = time.monotonic()
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None or now - site[0] >= self.window:
+                suppressed = site[2] if site is not None else 0
+                self._sites[key] = [now, 1, 0]
+                self._sites.move_to_end(key)
+                while len(self._sites) > MAX_SAMPLED_SITES:
+                    self._sites.popitem(last=False)
+                return suppressed
+            site[1] += 1
+            if site[1] <= self.burst or (site[1] - self.burst) % self.rate == 0:
+                suppressed, site[2] = site[2], 0
+                return suppressed
+            site[2] += 1
+            return None
+
+
+class SampledQueueHandler(QueueHandler):
+    def __init__(self, log_queue: queue.Queue, sampler: LogSampler):
+        super().__init__(log_queue)
+        self.sampler = sampler
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # As in QueueHandler.prepare, merge args now so they cannot change
+        # before the listener renders them, and queue a copy of the record that
+        # other handlers share. Tracebacks are still rendered by the listener.
+        record = copy.copy(record)
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def emit(self, record: logging.LogRecord) -> None:
+        suppressed = self.sampler.allow((record.name, record.pathname, record.lineno))
+        if suppressed is None:
+            log_events_dropped.inc(reason="sampled")
+            return
+        try:
+            prepared = self.prepare(record)
+        except Exception:
+            self.handleError(record)
+            return
+        prepared.suppressed = suppressed
+        try:
+            self.queue.put_nowait(prepared)
+        except queue.Full:
+            log_events_dropped.inc(reason="queue_full")
+
+
+def _add_suppressed(logger: Any, method_name: str, event_dict: dict) -> dict:
+    suppressed = getattr(event_dict.get("_record"), "suppressed", 0)
+    if suppressed:
+        event_dict["suppressed"] = suppressed
+    return event_dict
+
+
+def _add_record_timestamp(logger: Any, method_name: str, event_dict: dict) -> dict:
+    # Stdlib records are rendered later on the listener thread, so stamp them
+    # with their creation time rather than the time of rendering.
+    created = datetime.fromtimestamp(event_dict["_record"].created, timezone.utc)
+    event_dict["timestamp"] = created.isoformat().replace("+00:00", "Z")
+    return event_dict
+
+
+def _renderer() -> Any:
+    if config.app.log_format == "console":
+        return structlog.dev.ConsoleRenderer()
+    return structlog.processors.JSONRenderer()
+
+
+shared_processors = [
+    structlog.contextvars.merge_contextvars,
+    structlog.stdlib.add_log_level,
+    structlog.stdlib.add_logger_name,
+]
+
+
+class LogPipeline:
+    def __init__(self):
+        self._listener: QueueListener | None = None
+        self._handler: SampledQueueHandler | None = None
+
+    def configure(self) -> None:
+        if self._listener is not None:
+            return
+        output = logging.StreamHandler(sys.stdout)
+        output.setFormatter(
+            structlog.stdlib.ProcessorFormatter(
+                foreign_pre_chain=[*shared_processors, _add_record_timestamp],
+                processors=[
+                    _add_suppressed,
+                    structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+                    structlog.processors.format_exc_info,
+                    _renderer(),
+                ],
+            )
+        )
+        log_queue: queue.Queue = queue.Queue(config.app.log_queue_size)
+        self._handler = SampledQueueHandler(
+            log_queue,
+            LogSampler(
+                config.app.log_sample_burst,
+                config.app.log_sample_window,
+                config.app.log_sample_rate,
+            ),
+        )
+        self._listener = QueueListener(log_queue, output)
+
+        root = logging.getLogger()
+        root.addHandler(self._handler)
+        root.setLevel(config.app.log_level)
+
+        structlog.configure(
+            processors=[
+                *shared_processors,
+                structlog.processors.TimeStamper(fmt="iso"),
+                structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+            ],
+            logger_factory=structlog.stdlib.LoggerFactory(),
+            wrapper_class=structlog.stdlib.BoundLogger,
+            cache_logger_on_first_use=True,
+        )
+        self._listener.start()
+
+    async def start(self) -> None:
+        self.configure()
+
+    async def stop(self) -> None:
+        """Flush queued records and detach from the root logger."""
+        if self._listener is None:
+            return
+        self._listener.stop()
+        logging.getLogger().removeHandler(self._handler)
+        self._listener = None
+        self._handler = None
+
+
+log_pipeline = LogPipeline()
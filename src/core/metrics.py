@@ -0,0 +1,268 @@
+"""Minimal Prometheus-style metrics, per-request DB accounting and /metrics."""
+
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+from litestar.types import ASGIApp, Message, Receive, Scope, Send
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+LabelValues = tuple[tuple[str, str], ...]
+Sample = tuple[dict[str, Any], float]
+Collector = Callable[[], Iterable[tuple[str, str, str, Iterable[Sample]]]]
+
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50)
+
+
+def _labels(labels: dict[str, Any]) -> LabelValues:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: LabelValues, extra: tuple[str, str] | None = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = _labels(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        for labels, value in self._values.items():
+            yield f"{self.name}{_format_labels(labels)} {value}"
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        self._series: dict[LabelValues, list[float]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = _labels(labels)
+        series = self._series.get(key)
+        if series is None:
+            # One slot per bucket, then +Inf, sum and count.
+            series = self._series[key] = [0.0] * (len(self.buckets) + 3)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, series in self._series.items():
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                bucket = _format_labels(labels, ("le", str(bound)))
+                yield f"{self.name}_bucket{bucket} {cumulative}"
+            bucket = _format_labels(labels, ("le", "+Inf"))
+            yield f"{self.name}_bucket{bucket} {series[-1]}"
+            yield f"{self.name}_sum{_format_labels(labels)} {series[-2]}"
+            yield f"{self.name}_count{_format_labels(labels)} {series[-1]}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: list[Counter | Histogram] = []
+        self._collectors: list[Collector] = []
+
+    def counter(self, name: str, documentation: str) -> Counter:
+        metric = Counter(name, documentation)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        metric = Histogram(name, documentation, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Collector) -> None:
+        """Register a callback producing gauge/counter samples at scrape time."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            for name, metric_type, documentation, samples in collector():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(_labels(labels))} {value}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def register_cache(name: str, cache: Any) -> None:
+    """Export hit/miss/size of an object exposing ``stats()`` like TTLCache."""
+
+    def collect():
+        stats = cache.stats()
+        labels = {"cache": name}
+        yield "cache_hits_total", "counter", "Cache hits", [(labels, stats["hits"])]
+        yield "cache_misses_total", "counter", "Cache misses", [
+            (labels, stats["misses"])
+        ]
+        yield "cache_size", "gauge", "Cached entries", [(labels, stats["size"])]
+
+    registry.add_collector(collect)
+
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route"
+)
+http_request_db_queries = registry.histogram(
+    "http_request_db_queries",
+    "Database queries executed per HTTP request",
+    buckets=COUNT_BUCKETS,
+)
+http_request_db_duration = registry.histogram(
+    "http_request_db_duration_seconds", "Time spent in database queries per request"
+)
+db_query_duration = registry.histogram(
+    "db_query_duration_seconds", "Duration of individual database queries"
+)
+db_compiled_cache = registry.counter(
+    "db_compiled_cache_total",
+    "Statement executions by SQLAlchemy compiled-cache outcome",
+)
+db_pool_wait = registry.histogram(
+    "db_pool_wait_seconds", "Time spent waiting to check out a pooled connection"
+)
+password_hash_duration = registry.histogram(
+    "password_hash_duration_seconds",
+    "Password hashing and verification time, including pool queueing",
+)
+login_throttled = registry.counter(
+    "auth_login_throttled_total", "Login attempts rejected by the throttle"
+)
+http_requests_shed = registry.counter(
+    "http_requests_shed_total", "Requests rejected by the concurrency limiter"
+)
+log_events_dropped = registry.counter(
+    "log_events_dropped_total", "Log records dropped by sampling or a full queue"
+)
+oauth_token_refresh = registry.counter(
+    "oauth_token_refresh_total", "Background OAuth token refreshes by outcome"
+)
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    query_seconds: float = 0.0
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar(
+    "request_stats", default=None
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    db_query_duration.observe(elapsed)
+    cache_hit = getattr(context, "cache_hit", None)
+    if cache_hit is not None:
+        db_compiled_cache.inc(result=cache_hit.name.lower())
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.query_seconds += elapsed
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class MetricsMiddleware:
+    """Record per-route latency and per-request query counts."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            status_code = getattr(exc, "status_code", 500)
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            _request_stats.reset(token)
+            route = scope.get("path_template") or scope["path"]
+            method = scope["method"]
+            http_request_duration.observe(
+                elapsed, method=method, route=route, status=status_code
+            )
+            http_request_db_queries.observe(stats.queries, method=method, route=route)
+            http_request_db_duration.observe(
+                stats.query_seconds, method=method, route=route
+            )
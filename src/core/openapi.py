@@ -0,0 +1,77 @@
+"""Serve an OpenAPI document generated at build time.
+
+``python -m src.core.openapi build --output openapi.json`` writes the schema
+once. Starting the app with ``OPENAPI_PREBUILT_PATH`` pointing at that file
+disables runtime schema generation and serves the file under ``/schema``
+with the same pages Litestar renders by default.
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any
+
+from litestar import Request, Router, get
+from litestar.handlers import HTTPRouteHandler
+from litestar.openapi.plugins import (
+    JsonRenderPlugin,
+    OpenAPIRenderPlugin,
+    RedocRenderPlugin,
+    SwaggerRenderPlugin,
+)
+
+from src.core.config import config
+
+SCHEMA_PATH = "/schema"
+
+
+def load_prebuilt_schema() -> dict[str, Any] | None:
+    path = config.app.openapi_prebuilt_path
+    if not path or not Path(path).is_file():
+        return None
+    return json.loads(Path(path).read_bytes())
+
+
+def _render_handler(
+    plugin: OpenAPIRenderPlugin, paths: list[str], schema: dict[str, Any]
+) -> HTTPRouteHandler:
+    @get(paths, media_type=plugin.media_type, sync_to_thread=False)
+    def render(request: Request) -> bytes:
+        return plugin.render(request, schema)
+
+    return render
+
+
+def create_prebuilt_router(schema: dict[str, Any]) -> Router:
+    return Router(
+        SCHEMA_PATH,
+        route_handlers=[
+            _render_handler(RedocRenderPlugin(), ["/", "/redoc"], schema),
+            _render_handler(SwaggerRenderPlugin(), ["/swagger"], schema),
+            _render_handler(JsonRenderPlugin(), ["/openapi.json"], schema),
+        ],
+        include_in_schema=False,
+    )
+
+
+def build(output: str) -> None:
+    # Force runtime generation even if a prebuilt file is configured.
+    config.app.openapi_prebuilt_path = ""
+    from src.main import app
+
+    schema = app.openapi_schema.to_schema()
+    Path(output).write_text(json.dumps(schema, indent=2, sort_keys=True))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="OpenAPI schema tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser("build", help="Write the OpenAPI document")
+    build_parser.add_argument("--output", default="openapi.json")
+    args = parser.parse_args()
+    build(args.output)
+    print(f"OpenAPI schema written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,10 +10,13 @@ from sqlalchemy.future import Connection
 
 from account.models.base import Base
 from account.models.oauth import OAuthAccount
+from account.models.tokens import AuthSession, RevokedToken
 from account.models.users import User
 
 _ = User.__table__
 _ = OAuthAccount.__table__
+_ = RevokedToken.__table__
+_ = AuthSession.__table__
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 config = context.config
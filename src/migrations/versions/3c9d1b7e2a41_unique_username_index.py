@@ -0,0 +1,27 @@
+"""unique_username_index
+
+Revision ID: 3c9d1b7e2a41
+Revises: f11455d8dd66
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9d1b7e2a41'
+down_revision: Union[str, Sequence[str], None] = 'f11455d8dd66'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_user_account_username'), 'user_account', ['username'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_user_account_username'), table_name='user_account')
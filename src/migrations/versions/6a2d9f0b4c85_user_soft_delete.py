@@ -0,0 +1,30 @@
+"""user_soft_delete
+
+Revision ID: 6a2d9f0b4c85
+Revises: d4c81f6a9e27
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a2d9f0b4c85'
+down_revision: Union[str, Sequence[str], None] = 'd4c81f6a9e27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('user_account', sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_user_account_deleted_at', 'user_account', ['deleted_at'], unique=False, postgresql_where=sa.text('deleted_at IS NOT NULL'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_user_account_deleted_at', table_name='user_account', postgresql_where=sa.text('deleted_at IS NOT NULL'))
+    op.drop_column('user_account', 'deleted_at')
@@ -0,0 +1,32 @@
+"""oauth_account_indexes
+
+Revision ID: d4c81f6a9e27
+Revises: b5a7e0c3f218
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4c81f6a9e27'
+down_revision: Union[str, Sequence[str], None] = 'b5a7e0c3f218'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('oauth_account', sa.Column('refresh_claimed_until', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_oauth_account_expires_at'), 'oauth_account', ['expires_at'], unique=False)
+    op.create_index(op.f('ix_oauth_account_user_id'), 'oauth_account', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_oauth_account_user_id'), table_name='oauth_account')
+    op.drop_index(op.f('ix_oauth_account_expires_at'), table_name='oauth_account')
+    op.drop_column('oauth_account', 'refresh_claimed_until')
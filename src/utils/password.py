@@ -1,25 +1,97 @@
+import argparse
+import asyncio
 import base64
 import hashlib
 import logging
 import secrets
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from src.core.config import config
+from src.core.metrics import password_hash_duration
+
+# argon2 and the process pool machinery are only needed once a password is
+# actually hashed, so they are imported on first use to keep worker start-up
+# lean.
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+    from argon2 import PasswordHasher
 
 logger = logging.getLogger(__name__)
 
+PBKDF2_SCHEME = "pbkdf2_sha256"
+LEGACY_PBKDF2_ITERATIONS = 100000
+
+_executor: Executor | None = None
+_bulk_executor: "ProcessPoolExecutor | None" = None
+_argon2: "PasswordHasher | None" = None
+_in_flight = 0
+_bulk_in_flight = 0
+_bulk_slots: asyncio.Semaphore | None = None
+
+
+class PasswordHasherBusyError(Exception):
+    """Raised when the hashing pool has no free worker and its queue is full."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Password hashing pool is saturated")
+        self.retry_after = retry_after
+
+
+def _pbkdf2(password: str, salt: str, iterations: int) -> str:
+    hashed = hashlib.pbkdf2_hmac(
+        "sha256", password.encode("utf-8"), salt.encode("utf-8"), iterations
+    )
+    return base64.b64encode(hashed).decode("utf-8")
+
+
+def _argon2_hasher(
+    time_cost: int, memory_cost: int, parallelism: int
+) -> "PasswordHasher":
+    from argon2 import PasswordHasher, Type
+
+    return PasswordHasher(
+        time_cost=time_cost,
+        memory_cost=memory_cost,
+        parallelism=parallelism,
+        type=Type.ID,
+    )
+
+
+def _get_argon2() -> "PasswordHasher":
+    global _argon2
+    if _argon2 is None:
+        settings = config.password_hashing
+        _argon2 = _argon2_hasher(
+            settings.argon2_time_cost,
+            settings.argon2_memory_cost,
+            settings.argon2_parallelism,
+        )
+    return _argon2
+
 
 def hash_password(password: str) -> str:
+    """Hash with the configured scheme.
+
+    Formats: ``$argon2id$v=19$m=...,t=...,p=...$salt$hash`` (PHC string) or
+    ``pbkdf2_sha256$<iterations>$<salt>$<hash>``.
+    """
     try:
         if not password:
             msg = "Password cannot be empty"
             raise ValueError(msg)
-        salt = secrets.token_hex(16)
-        hashed = hashlib.pbkdf2_hmac(
-            "sha256",
-            password.encode("utf-8"),
-            salt.encode("utf-8"),
-            100000,
-        )
-        hashed_b64 = base64.b64encode(hashed).decode("utf-8")
-        return f"{salt}${hashed_b64}"
+        scheme = config.password_hashing.scheme
+        if scheme == "argon2id":
+            return _get_argon2().hash(password)
+        if scheme == PBKDF2_SCHEME:
+            iterations = config.password_hashing.pbkdf2_iterations
+            salt = secrets.token_hex(16)
+            hashed_b64 = _pbkdf2(password, salt, iterations)
+            return f"{PBKDF2_SCHEME}${iterations}${salt}${hashed_b64}"
+        msg = f"Unknown password hash scheme: {scheme}"
+        raise ValueError(msg)
 
     except Exception as e:
         logger.error(f"Error in hash_password: {str(e)}")
@@ -31,13 +103,241 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     try:
         if not hashed_password or "$" not in hashed_password:
             return False
-        salt, stored_hash = hashed_password.split("$", 1)
-        hashed = hashlib.pbkdf2_hmac(
-            "sha256", plain_password.encode("utf-8"), salt.encode("utf-8"), 100000
-        )
-        hashed_b64 = base64.b64encode(hashed).decode("utf-8")
+        if hashed_password.startswith("$argon2"):
+            from argon2.exceptions import VerificationError
+
+            try:
+                return _get_argon2().verify(hashed_password, plain_password)
+            except VerificationError:
+                return False
+        if hashed_password.startswith(f"{PBKDF2_SCHEME}$"):
+            _, iterations, salt, stored_hash = hashed_password.split("$", 3)
+            hashed_b64 = _pbkdf2(plain_password, salt, int(iterations))
+        else:
+            # Unversioned ``salt$hash`` written before hashes carried a scheme.
+            salt, stored_hash = hashed_password.split("$", 1)
+            hashed_b64 = _pbkdf2(plain_password, salt, LEGACY_PBKDF2_ITERATIONS)
         return secrets.compare_digest(hashed_b64, stored_hash)
 
     except Exception as e:
         logger.error(f"Error in verify_password: {str(e)}")
         return False
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """True when the hash was not made with the configured scheme and cost."""
+    settings = config.password_hashing
+    if settings.scheme == "argon2id":
+        if not hashed_password.startswith("$argon2id$"):
+            return True
+        from argon2.exceptions import InvalidHashError
+
+        try:
+            return _get_argon2().check_needs_rehash(hashed_password)
+        except InvalidHashError:
+            return True
+    if settings.scheme == PBKDF2_SCHEME:
+        if not hashed_password.startswith(f"{PBKDF2_SCHEME}$"):
+            return True
+        return hashed_password.split("$", 2)[1] != str(settings.pbkdf2_iterations)
+    return False
+
+
+def verify_and_rehash(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """Verify, and return a fresh hash if the stored one is outdated."""
+    if not verify_password(plain_password, hashed_password):
+        return False, None
+    if needs_rehash(hashed_password):
+        return True, hash_password(plain_password)
+    return True, None
+
+
+def _get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        settings = config.password_hashing
+        if settings.executor == "process":
+            from concurrent.futures import ProcessPoolExecutor
+
+            _executor = ProcessPoolExecutor(max_workers=settings.max_workers)
+        else:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.max_workers,
+                thread_name_prefix="password-hash",
+            )
+    return _executor
+
+
+async def _run_in_pool(func, *args, bulk: bool = False):
+    """Run ``func`` on the shared pool.
+
+    Interactive calls are admitted against ``max_workers + max_queue``. Bulk
+    calls are bounded by their own semaphore and counted separately, so an
+    import never uses up the admission budget of logins.
+    """
+    global _in_flight, _bulk_in_flight
+    settings = config.password_hashing
+    if bulk:
+        _bulk_in_flight += 1
+    elif _in_flight >= settings.max_workers + settings.max_queue:
+        raise PasswordHasherBusyError(retry_after=settings.retry_after)
+    else:
+        _in_flight += 1
+    started = time.perf_counter()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), func, *args)
+    finally:
+        if bulk:
+            _bulk_in_flight -= 1
+        else:
+            _in_flight -= 1
+        password_hash_duration.observe(
+            time.perf_counter() - started, operation=func.__name__
+        )
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_in_pool(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_pool(verify_password, plain_password, hashed_password)
+
+
+async def verify_and_rehash_async(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    return await _run_in_pool(verify_and_rehash, plain_password, hashed_password)
+
+
+def _get_bulk_executor() -> "ProcessPoolExecutor":
+    global _bulk_executor
+    if _bulk_executor is None:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        _bulk_executor = ProcessPoolExecutor(
+            max_workers=config.password_hashing.bulk_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _bulk_executor
+
+
+def _hash_many(passwords: list[str]) -> list[str]:
+    return [hash_password(password) for password in passwords]
+
+
+async def hash_passwords_parallel(
+    passwords: list[str], dedicated_pool: bool = False
+) -> list[str]:
+    """Hash many passwords for a bulk import.
+
+    By default the login pool is shared: the import waits for one of its
+    ``bulk_slots`` instead of being rejected, and never holds every worker, so
+    /auth/login keeps a worker and its whole queue. That needs at least two
+    workers; see ``shared_bulk_hashing_available``. ``dedicated_pool`` is for
+    the CLI, which has no login traffic and spawns ``bulk_workers`` processes.
+    """
+    if not passwords:
+        return []
+    if dedicated_pool:
+        return await _hash_in_bulk_executor(passwords)
+    if not shared_bulk_hashing_available():
+        raise RuntimeError(
+            "Bulk hashing on the shared pool needs PASSWORD_HASH_MAX_WORKERS >= 2"
+        )
+
+    global _bulk_slots
+    if _bulk_slots is None:
+        settings = config.password_hashing
+        _bulk_slots = asyncio.Semaphore(
+            min(settings.bulk_slots, settings.max_workers - 1)
+        )
+
+    async def hash_one(password: str) -> str:
+        async with _bulk_slots:
+            return await _run_in_pool(hash_password, password, bulk=True)
+
+    return list(await asyncio.gather(*(hash_one(password) for password in passwords)))
+
+
+def shared_bulk_hashing_available() -> bool:
+    """With one worker, any bulk slot would take login's only worker."""
+    return config.password_hashing.max_workers >= 2
+
+
+async def _hash_in_bulk_executor(passwords: list[str]) -> list[str]:
+    workers = config.password_hashing.bulk_workers
+    size = -(-len(passwords) // workers)
+    loop = asyncio.get_running_loop()
+    executor = _get_bulk_executor()
+    results = await asyncio.gather(
+        *(
+            loop.run_in_executor(executor, _hash_many, passwords[i : i + size])
+            for i in range(0, len(passwords), size)
+        )
+    )
+    return [hashed for chunk in results for hashed in chunk]
+
+
+def shutdown_password_executor() -> None:
+    global _executor, _bulk_executor, _bulk_slots
+    _bulk_slots = None
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+    if _bulk_executor is not None:
+        _bulk_executor.shutdown(wait=False, cancel_futures=True)
+        _bulk_executor = None
+
+
+def _time_once(func) -> float:
+    started = time.perf_counter()
+    func()
+    return (time.perf_counter() - started) * 1000
+
+
+def calibrate(target_ms: float) -> dict[str, int]:
+    """Pick PBKDF2 iterations and argon2 time cost close to ``target_ms``."""
+    settings = config.password_hashing
+    probe = 100000
+    pbkdf2_ms = min(
+        _time_once(lambda: _pbkdf2("calibrate", "salt", probe)) for _ in range(3)
+    )
+    iterations = max(probe // 10, int(probe * target_ms / pbkdf2_ms) // 1000 * 1000)
+
+    time_cost = 1
+    while time_cost < 32:
+        hasher = _argon2_hasher(
+            time_cost, settings.argon2_memory_cost, settings.argon2_parallelism
+        )
+        if _time_once(lambda: hasher.hash("calibrate")) >= target_ms:
+            break
+        time_cost += 1
+    return {
+        "PASSWORD_HASH_PBKDF2_ITERATIONS": iterations,
+        "PASSWORD_HASH_ARGON2_TIME_COST": time_cost,
+        "PASSWORD_HASH_ARGON2_MEMORY_COST": settings.argon2_memory_cost,
+        "PASSWORD_HASH_ARGON2_PARALLELISM": settings.argon2_parallelism,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Password hashing tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    calibrate_parser = commands.add_parser(
+        "calibrate", help="Print cost settings for the target latency on this host"
+    )
+    calibrate_parser.add_argument(
+        "--target-ms", type=float, default=config.password_hashing.target_ms
+    )
+    args = parser.parse_args()
+    for name, value in calibrate(args.target_ms).items():
+        print(f"{name}={value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+import time
+
+import pytest
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Drive ``time.monotonic`` by hand; only for tests without an event loop."""
+    fake = FakeClock()
+    monkeypatch.setattr(time, "monotonic", fake)
+    return fake
+
+
+@pytest.fixture
+def wall_clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Drive ``time.time`` by hand, starting from the real time."""
+    fake = FakeClock(time.time())
+    monkeypatch.setattr(time, "time", fake)
+    return fake
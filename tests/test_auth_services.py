@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import Delete, Insert, Update
+
+from src.auth import services
+from src.auth.services import TokenService
+
+
+class FakeResult:
+    def __init__(self, value=None):
+        self.value = value
+
+    def scalar_one_or_none(self):
+        return self.value
+
+
+class FakeSessions:
+    """In-memory ``auth_session`` table behind an AsyncSession-like interface."""
+
+    def __init__(self):
+        self.rows: dict[str, dict] = {}
+
+    async def execute(self, stmt, params=None):
+        values = stmt.compile().params
+        if isinstance(stmt, Insert):
+            self.rows[values["id"]] = values
+            return FakeResult()
+        row = self.rows.get(values["id_1"])
+        if isinstance(stmt, Update):
+            if (
+                row is None
+                or row["token_hash"] != values["token_hash_1"]
+                or row["expires_at"] <= datetime.now(timezone.utc)
+            ):
+                return FakeResult()
+            row.update(token_hash=values["token_hash"], expires_at=values["expires_at"])
+            return FakeResult(row["user_id"])
+        if isinstance(stmt, Delete):
+            self.rows.pop(values["id_1"], None)
+            return FakeResult(row and row["token_hash"])
+        raise AssertionError(f"Unexpected statement {stmt}")
+
+    async def commit(self):
+        pass
+
+
+@pytest.fixture
+def db() -> FakeSessions:
+    return FakeSessions()
+
+
+@pytest.fixture
+def revoked_users(monkeypatch) -> list[int]:
+    revoked = []
+
+    async def revoke_user(user_id: int) -> None:
+        revoked.append(user_id)
+
+    monkeypatch.setattr(services.revocation_store, "revoke_user", revoke_user)
+    return revoked
+
+
+@pytest.fixture
+def token_service(db) -> TokenService:
+    return TokenService(SimpleNamespace(session=db))
+
+
+async def test_rotation_returns_new_token_and_retires_old(
+    token_service, db, revoked_users
+):
+    first = await token_service.start_session(1, "ann@example.com")
+
+    tokens = await token_service.refresh_access_token(first)
+    assert tokens["refresh_token"] != first
+    assert token_service.verify_token(tokens["access_token"])["sub"] == "1"
+    assert await token_service.refresh_access_token(tokens["refresh_token"])
+    assert revoked_users == []
+
+
+async def test_reused_refresh_token_ends_session(token_service, db, revoked_users):
+    first = await token_service.start_session(1, "ann@example.com")
+    rotated = (await token_service.refresh_access_token(first))["refresh_token"]
+
+    assert await token_service.refresh_access_token(first) is None
+    assert db.rows == {}
+    assert revoked_users == [1]
+    # The legitimate holder's newer token went with the session.
+    assert await token_service.refresh_access_token(rotated) is None
+
+
+async def test_expired_session_is_rejected(token_service, db, revoked_users):
+    token = await token_service.start_session(1, "ann@example.com")
+    (row,) = db.rows.values()
+    row["expires_at"] = datetime.now(timezone.utc) - timedelta(seconds=1)
+
+    assert await token_service.refresh_access_token(token) is None
+    assert db.rows == {}
+    # The token matched its session, so this is not reuse.
+    assert revoked_users == []
+
+
+async def test_access_token_cannot_refresh(token_service, db, revoked_users):
+    await token_service.start_session(1, "ann@example.com")
+    access = token_service.create_access_token(1, "ann@example.com")
+    assert await token_service.refresh_access_token(access) is None
+    assert len(db.rows) == 1
@@ -0,0 +1,111 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.account.bulk import iter_lines, iter_records, read_chunks
+from src.core.config import config
+from src.utils import password
+
+
+async def chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+async def records(data: bytes, import_format: str, split: int = 7) -> list:
+    parts = [data[i : i + split] for i in range(0, len(data), split)]
+    return [
+        entry async for entry in iter_records(iter_lines(chunks(*parts)), import_format)
+    ]
+
+
+async def test_csv_keeps_quoted_newlines_in_their_field():
+    data = (
+        b"email,username,password\r\n"
+        b'ann@example.com,ann,"multi\r\nline"\r\n'
+        b"\r\n"
+        b"bob@example.com,bob,Secret123\r\n"
+    )
+    assert await records(data, "csv") == [
+        (
+            2,
+            {"email": "ann@example.com", "username": "ann", "password": "multi\nline"},
+            None,
+        ),
+        (
+            5,
+            {"email": "bob@example.com", "username": "bob", "password": "Secret123"},
+            None,
+        ),
+    ]
+
+
+async def test_csv_reports_malformed_record_and_continues():
+    data = b'email,username,password\na@example.com,"a"b,x\nb@example.com,b,y\n'
+    (line, record, error), valid = await records(data, "csv")
+    assert (line, record) == (2, None)
+    assert error
+    assert valid == (
+        3,
+        {"email": "b@example.com", "username": "b", "password": "y"},
+        None,
+    )
+
+
+async def test_ndjson_reports_non_objects_by_line():
+    data = b'{"email": "a@example.com"}\n\n[1]\nnot json\n'
+    result = await records(data, "ndjson")
+    assert result[0] == (1, {"email": "a@example.com"}, None)
+    assert [(line, record) for line, record, _ in result[1:]] == [(3, None), (4, None)]
+
+
+async def test_read_chunks_streams_file(tmp_path):
+    path = tmp_path / "users.ndjson"
+    path.write_bytes(b"x" * 10)
+    assert [chunk async for chunk in read_chunks(str(path), chunk_size=4)] == [
+        b"xxxx",
+        b"xxxx",
+        b"xx",
+    ]
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    settings = config.password_hashing
+    monkeypatch.setattr(settings, "executor", "thread")
+    monkeypatch.setattr(settings, "max_workers", 2)
+    monkeypatch.setattr(settings, "max_queue", 0)
+    monkeypatch.setattr(settings, "bulk_slots", 4)
+    password.shutdown_password_executor()
+    yield settings
+    password.shutdown_password_executor()
+
+
+async def test_bulk_hashing_leaves_login_admission_budget(pool, monkeypatch):
+    release = threading.Event()
+    started = threading.Event()
+
+    def hash_password(plain: str) -> str:
+        started.set()
+        release.wait(5)
+        return f"hashed:{plain}"
+
+    monkeypatch.setattr(password, "hash_password", hash_password)
+    bulk = asyncio.create_task(password.hash_passwords_parallel(["a", "b", "c"]))
+    await asyncio.to_thread(started.wait, 5)
+    # bulk_slots is capped at max_workers - 1 and not counted against logins.
+    assert (password._bulk_in_flight, password._in_flight) == (1, 0)
+
+    logins = [password._run_in_pool(len, "x"), password._run_in_pool(len, "y")]
+    release.set()
+    assert await asyncio.gather(*logins) == [1, 1]
+    assert await bulk == ["hashed:a", "hashed:b", "hashed:c"]
+    assert (password._bulk_in_flight, password._in_flight) == (0, 0)
+
+
+async def test_shared_bulk_hashing_needs_two_workers(pool, monkeypatch):
+    monkeypatch.setattr(pool, "max_workers", 1)
+    assert not password.shared_bulk_hashing_available()
+    with pytest.raises(RuntimeError):
+        await password.hash_passwords_parallel(["a"])
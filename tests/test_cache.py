@@ -0,0 +1,56 @@
+from src.utils.cache import TTLCache
+
+
+def test_entry_expires_after_ttl(clock):
+    cache = TTLCache(maxsize=10, ttl=5)
+    cache.set("a", 1)
+    clock.advance(4.9)
+    assert cache.get("a") == 1
+    clock.advance(0.1)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_per_entry_ttl_is_capped_by_cache_ttl(clock):
+    cache = TTLCache(maxsize=10, ttl=5)
+    cache.set("short", 1, ttl=1)
+    cache.set("long", 2, ttl=60)
+    clock.advance(1)
+    assert cache.get("short") is None
+    clock.advance(3.9)
+    assert cache.get("long") == 2
+    clock.advance(0.1)
+    assert cache.get("long") is None
+
+
+def test_evicts_least_recently_used(clock):
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_zero_maxsize_disables_cache(clock):
+    cache = TTLCache(maxsize=0, ttl=60)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+
+def test_stats_count_hits_and_misses(clock):
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("missing")
+    cache.invalidate("a")
+    cache.get("a")
+    assert cache.stats() == {
+        "size": 0,
+        "maxsize": 10,
+        "hits": 1,
+        "misses": 2,
+        "hit_ratio": 1 / 3,
+    }
@@ -0,0 +1,170 @@
+import asyncio
+
+import pytest
+
+from src.core import limiter as limiter_module
+from src.core.config import config
+from src.core.limiter import (
+    AUTHENTICATED_READ_PRIORITY,
+    DEFAULT_PRIORITY,
+    AdaptiveLimiter,
+    route_key,
+    route_priority,
+)
+
+
+def make_limiter(**overrides) -> AdaptiveLimiter:
+    settings = {
+        "initial_limit": 2,
+        "min_limit": 1,
+        "max_limit": 10,
+        "tolerance": 2.0,
+        "backoff": 0.5,
+        "max_queue": 2,
+        "queue_timeout": 1.0,
+    }
+    return AdaptiveLimiter(**(settings | overrides))
+
+
+async def test_admits_up_to_limit_then_queues():
+    limiter = make_limiter()
+    assert await limiter.acquire(DEFAULT_PRIORITY) is None
+    assert await limiter.acquire(DEFAULT_PRIORITY) is None
+    waiter = asyncio.create_task(limiter.acquire(DEFAULT_PRIORITY))
+    await asyncio.sleep(0)
+    assert (limiter.in_flight, limiter.queued) == (2, 1)
+
+    limiter.release()
+    assert await waiter is None
+    assert (limiter.in_flight, limiter.queued) == (2, 0)
+
+
+async def test_waiters_are_admitted_by_priority():
+    limiter = make_limiter(initial_limit=1)
+    await limiter.acquire(DEFAULT_PRIORITY)
+    low = asyncio.create_task(limiter.acquire(DEFAULT_PRIORITY))
+    await asyncio.sleep(0)
+    high = asyncio.create_task(limiter.acquire(0))
+    await asyncio.sleep(0)
+
+    limiter.release()
+    assert await high is None
+    assert not low.done()
+    limiter.release()
+    assert await low is None
+
+
+async def test_full_queue_evicts_lower_priority_waiter():
+    limiter = make_limiter(initial_limit=1, max_queue=1)
+    await limiter.acquire(DEFAULT_PRIORITY)
+    low = asyncio.create_task(limiter.acquire(DEFAULT_PRIORITY))
+    await asyncio.sleep(0)
+
+    high = asyncio.create_task(limiter.acquire(0))
+    assert await low == "evicted"
+    assert limiter.queued == 1
+    assert await limiter.acquire(DEFAULT_PRIORITY) == "queue_full"
+
+    limiter.release()
+    assert await high is None
+
+
+async def test_queue_timeout_sheds_and_leaves_queue():
+    limiter = make_limiter(initial_limit=1, queue_timeout=0.01)
+    await limiter.acquire(DEFAULT_PRIORITY)
+    assert await limiter.acquire(DEFAULT_PRIORITY) == "timeout"
+    assert (limiter.in_flight, limiter.queued) == (1, 0)
+
+
+async def test_zero_queue_sheds_without_waiting():
+    limiter = make_limiter(initial_limit=1, max_queue=0)
+    await limiter.acquire(DEFAULT_PRIORITY)
+    assert await limiter.acquire(0) == "queue_full"
+    assert limiter.queued == 0
+
+
+def test_steady_slow_route_keeps_limit(clock):
+    limiter = make_limiter(initial_limit=4)
+    for _ in range(50):
+        limiter.in_flight += 1
+        limiter.release("GET /reports", 3.0)
+        clock.advance(1)
+    assert limiter.limit == 4
+
+
+def test_latency_above_baseline_backs_off_once_per_response_time(clock):
+    limiter = make_limiter(initial_limit=8)
+    for _ in range(3):
+        limiter.in_flight += 1
+        limiter.release("GET /users", 0.01)
+    limiter.in_flight += 2
+    limiter.release("GET /users", 0.5)
+    limiter.release("GET /users", 0.5)
+    assert limiter.limit == 4
+
+    clock.advance(1)
+    limiter.in_flight += 1
+    limiter.release("GET /users", 0.5)
+    assert limiter.limit == 2
+
+
+def test_saturated_fast_responses_grow_limit(clock):
+    limiter = make_limiter(initial_limit=2)
+    limiter.in_flight = 2
+    limiter.release("GET /users", 0.01)
+    limiter.in_flight += 1
+    limiter.release("GET /users", 0.01)
+    assert limiter.limit == 2.5
+
+
+def test_baselines_are_bounded(clock, monkeypatch):
+    monkeypatch.setattr(limiter_module, "MAX_TRACKED_ROUTES", 2)
+    limiter = make_limiter()
+    for route in ("GET /a", "GET /b", "GET /c"):
+        limiter.in_flight += 1
+        limiter.release(route, 0.01)
+    assert list(limiter._baselines) == ["GET /b", "GET /c"]
+
+
+def scope(method: str, path: str, authorization: bool = False) -> dict:
+    headers = [(b"authorization", b"Bearer token")] if authorization else []
+    return {"type": "http", "method": method, "path": path, "headers": headers}
+
+
+@pytest.mark.parametrize(
+    ("request_scope", "expected"),
+    [
+        (scope("POST", "/auth/refresh"), 0),
+        (scope("GET", "/users/me", authorization=True), AUTHENTICATED_READ_PRIORITY),
+        (scope("POST", "/users", authorization=True), DEFAULT_PRIORITY),
+        (scope("GET", "/users/me"), DEFAULT_PRIORITY),
+    ],
+)
+def test_route_priority(request_scope, expected, monkeypatch):
+    monkeypatch.setattr(config.limiter, "route_priorities", (("/auth/refresh", 0),))
+    assert route_priority(request_scope) == expected
+
+
+def test_route_key_collapses_ids():
+    assert route_key(scope("GET", "/users/42/sessions")) == "GET /users/{id}/sessions"
+
+
+async def test_full_queue_skips_waiter_whose_timeout_fired():
+    limiter = make_limiter(initial_limit=1, max_queue=1)
+    await limiter.acquire(DEFAULT_PRIORITY)
+    low = asyncio.create_task(limiter.acquire(DEFAULT_PRIORITY))
+    await asyncio.sleep(0)
+
+    # The high-priority request is scheduled before the low one's timeout
+    # fires: cancelling the task cancels its future at once, but the task only
+    # leaves the queue when it next runs, after the new request.
+    high = asyncio.create_task(limiter.acquire(0))
+    low.cancel()
+    await asyncio.sleep(0)
+    assert limiter.queued == 1
+    with pytest.raises(asyncio.CancelledError):
+        await low
+
+    limiter.release()
+    assert await high is None
+    assert (limiter.in_flight, limiter.queued) == (1, 0)
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from src.account.loader import BatchLoader
+
+
+class RecordingFetch:
+    def __init__(self, delay: float = 0.0):
+        self.calls: list[list[int]] = []
+        self.delay = delay
+
+    async def __call__(self, keys: list[int]) -> dict[int, str]:
+        self.calls.append(list(keys))
+        await asyncio.sleep(self.delay)
+        return {key: f"user-{key}" for key in keys if key != 404}
+
+
+async def test_concurrent_loads_share_one_fetch():
+    fetch = RecordingFetch()
+    loader = BatchLoader(fetch)
+    results = await asyncio.gather(
+        loader.load(1), loader.load(2), loader.load(1), loader.load(404)
+    )
+    assert results == ["user-1", "user-2", "user-1", None]
+    assert fetch.calls == [[1, 2, 404]]
+
+
+async def test_max_batch_splits_fetches():
+    fetch = RecordingFetch()
+    loader = BatchLoader(fetch, max_batch=2)
+    assert await loader.load_many([1, 2, 3]) == ["user-1", "user-2", "user-3"]
+    assert fetch.calls == [[1, 2], [3]]
+
+
+async def test_key_in_flight_is_not_fetched_again():
+    fetch = RecordingFetch(delay=0.01)
+    loader = BatchLoader(fetch)
+    first = asyncio.create_task(loader.load(1))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(loader.load(1))
+    assert await asyncio.gather(first, second) == ["user-1", "user-1"]
+    assert fetch.calls == [[1]]
+    # Results are not cached once the batch completes.
+    await loader.load(1)
+    assert fetch.calls == [[1], [1]]
+
+
+async def test_fetch_error_reaches_every_caller():
+    async def failing(keys):
+        raise RuntimeError("database down")
+
+    loader = BatchLoader(failing)
+    results = await asyncio.gather(
+        loader.load(1), loader.load(2), return_exceptions=True
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+async def test_cancelled_caller_does_not_cancel_shared_lookup():
+    fetch = RecordingFetch(delay=0.01)
+    loader = BatchLoader(fetch)
+    cancelled = asyncio.create_task(loader.load(1))
+    survivor = asyncio.create_task(loader.load(1))
+    await asyncio.sleep(0.001)
+    cancelled.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    assert await survivor == "user-1"
@@ -0,0 +1,83 @@
+import logging
+import queue
+
+from src.core import logs
+from src.core.logs import LogSampler, SampledQueueHandler
+
+
+def test_sampler_allows_burst_then_one_in_rate(clock):
+    sampler = LogSampler(burst=3, window=60, rate=5)
+    decisions = [sampler.allow("site") for _ in range(13)]
+    assert decisions[:3] == [0, 0, 0]
+    # After the burst every fifth record passes and reports the ones it replaced.
+    assert decisions[3:] == [None, None, None, None, 4, None, None, None, None, 4]
+
+
+def test_sampler_reports_suppressed_count_in_next_window(clock):
+    sampler = LogSampler(burst=1, window=60, rate=100)
+    for _ in range(4):
+        sampler.allow("site")
+    clock.advance(60)
+    assert sampler.allow("site") == 3
+    assert sampler.allow("other") == 0
+
+
+def record(lineno: int = 1) -> logging.LogRecord:
+    return logging.LogRecord(
+        "src.test", logging.ERROR, "test.py", lineno, "x", (), None
+    )
+
+
+def test_handler_counts_sampled_and_overflowing_records(clock, monkeypatch):
+    dropped = []
+    monkeypatch.setattr(
+        logs.log_events_dropped,
+        "inc",
+        lambda amount=1, **labels: dropped.append(labels),
+    )
+    log_queue: queue.Queue = queue.Queue(maxsize=2)
+    handler = SampledQueueHandler(log_queue, LogSampler(burst=3, window=60, rate=100))
+    for _ in range(4):
+        handler.emit(record())
+    assert log_queue.qsize() == 2
+    assert dropped == [{"reason": "queue_full"}, {"reason": "sampled"}]
+
+
+def test_handler_queues_a_copy_with_args_merged(clock):
+    log_queue: queue.Queue = queue.Queue()
+    handler = SampledQueueHandler(log_queue, LogSampler(burst=1, window=60, rate=1))
+    items = ["a"]
+    original = logging.LogRecord(
+        "src.test", logging.INFO, "test.py", 1, "items: %s", (items,), None
+    )
+    handler.emit(original)
+    items.append("b")
+
+    queued = log_queue.get_nowait()
+    assert queued is not original
+    assert queued.getMessage() == "items: ['a']"
+    assert queued.suppressed == 0
+    assert original.args == (items,)
+    assert not hasattr(original, "suppressed")
+
+
+def test_handler_keeps_structlog_event_dicts(clock):
+    log_queue: queue.Queue = queue.Queue()
+    handler = SampledQueueHandler(log_queue, LogSampler(burst=1, window=60, rate=1))
+    event = {"event": "login", "user_id": 1}
+    original = logging.LogRecord(
+        "src.test", logging.INFO, "test.py", 1, event, (), None
+    )
+    handler.emit(original)
+    assert log_queue.get_nowait().msg is event
+
+
+def test_handler_reports_bad_format_args(clock, monkeypatch):
+    errors = []
+    log_queue: queue.Queue = queue.Queue()
+    handler = SampledQueueHandler(log_queue, LogSampler(burst=1, window=60, rate=1))
+    monkeypatch.setattr(handler, "handleError", errors.append)
+    bad = logging.LogRecord("src.test", logging.INFO, "test.py", 1, "%d", ("x",), None)
+    handler.emit(bad)
+    assert errors == [bad]
+    assert log_queue.empty()
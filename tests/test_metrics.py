@@ -0,0 +1,45 @@
+from src.core.metrics import Counter, Histogram, MetricsRegistry
+
+
+def test_counter_renders_labelled_series():
+    counter = Counter("logins_total", "Logins")
+    counter.inc(result="ok")
+    counter.inc(2, result="ok")
+    counter.inc(result='say "hi"')
+    assert list(counter.render()) == [
+        "# HELP logins_total Logins",
+        "# TYPE logins_total counter",
+        'logins_total{result="ok"} 3',
+        'logins_total{result="say \\"hi\\""} 1',
+    ]
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value, route="/users")
+    assert list(histogram.render())[2:] == [
+        'latency_seconds_bucket{route="/users",le="0.1"} 2.0',
+        'latency_seconds_bucket{route="/users",le="1.0"} 3.0',
+        'latency_seconds_bucket{route="/users",le="+Inf"} 4.0',
+        'latency_seconds_sum{route="/users"} 2.65',
+        'latency_seconds_count{route="/users"} 4.0',
+    ]
+
+
+def test_registry_renders_metrics_and_collectors():
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests").inc()
+
+    def collect():
+        yield "pool_size", "gauge", "Pool size", [({"pool": "primary"}, 20)]
+
+    registry.add_collector(collect)
+    assert registry.render() == (
+        "# HELP requests_total Requests\n"
+        "# TYPE requests_total counter\n"
+        "requests_total 1\n"
+        "# HELP pool_size Pool size\n"
+        "# TYPE pool_size gauge\n"
+        'pool_size{pool="primary"} 20\n'
+    )
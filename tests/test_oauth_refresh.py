@@ -0,0 +1,190 @@
+import asyncio
+import logging
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from src.auth.oauth_refresh import OAuthTokenRefresher, RefreshPass
+from src.core.config import OAuthProviderConfig, config
+
+
+class FakeAccounts:
+    """``oauth_account`` rows claimed the way CLAIM_DUE_ACCOUNTS does.
+
+    Refreshed tokens are issued with a short TTL, so every stored account is
+    due again straight away.
+    """
+
+    def __init__(self, count: int, failing: frozenset[int] = frozenset()):
+        now = int(time.time())
+        self.rows = {
+            id: {"id": id, "expires_at": now + 10 - id % 3, "claimed_until": None}
+            for id in range(1, count + 1)
+        }
+        self.failing = failing
+        self.cursors: list[tuple[int, int]] = []
+        self.refreshed: list[int] = []
+        self.stored: list[int] = []
+
+    async def claim(self, refresh_pass: RefreshPass):
+        self.cursors.append(refresh_pass.after)
+        claimed_until = int(time.time()) + config.oauth.refresh_lease
+        due = sorted(
+            (row["expires_at"], row["id"])
+            for row in self.rows.values()
+            if row["expires_at"] is not None
+            and row["expires_at"] < refresh_pass.started + config.oauth.refresh_lead
+            and (row["expires_at"], row["id"]) > refresh_pass.after
+            and (row["claimed_until"] or 0) < refresh_pass.started
+        )[: config.oauth.refresh_batch_size]
+        claimed = []
+        for expires_at, id in due:
+            self.rows[id]["claimed_until"] = claimed_until
+            claimed.append(
+                SimpleNamespace(id=id, provider="test", expires_at=expires_at)
+            )
+        return claimed, claimed_until
+
+    async def refresh(self, account, provider):
+        self.refreshed.append(account.id)
+        if account.id in self.failing:
+            return None
+        return {"account_id": account.id, "new_expires_at": int(time.time()) + 5}
+
+    async def store(self, updates):
+        for update in updates:
+            row = self.rows[update["account_id"]]
+            assert row["claimed_until"] == update["claimed_until"]
+            row["expires_at"] = update["new_expires_at"]
+            self.stored.append(update["account_id"])
+
+
+@pytest.fixture
+def provider(monkeypatch) -> OAuthProviderConfig:
+    provider = OAuthProviderConfig("http://oauth.test/token", "id", "secret", 4)
+    monkeypatch.setattr(config.oauth, "providers", {"test": provider})
+    monkeypatch.setattr(config.oauth, "refresh_batch_size", 3)
+    return provider
+
+
+@pytest.fixture
+def refresher(provider) -> OAuthTokenRefresher:
+    return OAuthTokenRefresher()
+
+
+def install(monkeypatch, refresher, accounts: FakeAccounts) -> None:
+    monkeypatch.setattr(refresher, "_claim", accounts.claim)
+    monkeypatch.setattr(refresher, "_refresh", accounts.refresh)
+    monkeypatch.setattr(refresher, "_store", accounts.store)
+
+
+async def test_pass_claims_each_account_once(refresher, monkeypatch):
+    accounts = FakeAccounts(7)
+    install(monkeypatch, refresher, accounts)
+
+    assert await refresher.refresh_due_accounts() == 7
+    assert sorted(accounts.refreshed) == list(range(1, 8))
+    # The keyset moves forward by (expires_at, id) on every claim.
+    assert accounts.cursors[0] == (-1, 0)
+    assert accounts.cursors == sorted(accounts.cursors)
+    assert len(accounts.cursors) == 3
+
+
+async def test_pass_stops_after_a_full_final_batch(refresher, monkeypatch):
+    accounts = FakeAccounts(6)
+    install(monkeypatch, refresher, accounts)
+
+    assert await refresher.refresh_due_accounts() == 6
+    assert len(accounts.cursors) == 3
+
+
+async def test_failed_accounts_are_skipped_but_not_stored(refresher, monkeypatch):
+    accounts = FakeAccounts(5, failing=frozenset({1, 2, 3}))
+    install(monkeypatch, refresher, accounts)
+
+    assert await refresher.refresh_due_accounts() == 2
+    assert sorted(accounts.stored) == [4, 5]
+    assert sorted(accounts.refreshed) == [1, 2, 3, 4, 5]
+
+
+async def test_next_pass_waits_for_the_lease(refresher, monkeypatch):
+    accounts = FakeAccounts(2)
+    install(monkeypatch, refresher, accounts)
+    await refresher.refresh_due_accounts()
+
+    assert await refresher.refresh_due_accounts() == 0
+    for row in accounts.rows.values():
+        row["claimed_until"] = int(time.time()) - 1
+    assert await refresher.refresh_due_accounts() == 2
+
+
+async def test_empty_claim_skips_store(refresher, monkeypatch):
+    accounts = FakeAccounts(0)
+    install(monkeypatch, refresher, accounts)
+    refresh_pass = RefreshPass(started=int(time.time()))
+
+    assert await refresher.refresh_batch(refresh_pass) == (0, 0)
+    assert refresh_pass.after == (-1, 0)
+    assert accounts.stored == []
+
+
+def client_answering(status_code: int, body: dict) -> httpx.AsyncClient:
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(status_code, json=body)
+    )
+    return httpx.AsyncClient(transport=transport)
+
+
+@pytest.fixture
+def account():
+    return SimpleNamespace(
+        id=1, provider="test", access_token="old-access", refresh_token="old-refresh"
+    )
+
+
+async def call_refresh(refresher, provider, account, status_code, body):
+    refresher._client = client_answering(status_code, body)
+    refresher._limits = {"test": asyncio.Semaphore(1)}
+    try:
+        return await refresher._refresh(account, provider)
+    finally:
+        await refresher._client.aclose()
+
+
+async def test_refresh_returns_new_tokens(refresher, provider, account):
+    update = await call_refresh(
+        refresher,
+        provider,
+        account,
+        200,
+        {"access_token": "new-access", "expires_in": 3600},
+    )
+    assert update["new_access_token"] == "new-access"
+    assert update["new_refresh_token"] == "old-refresh"
+    assert update["new_expires_at"] >= int(time.time()) + 3599
+
+
+async def test_invalid_grant_stops_refreshing(refresher, provider, account):
+    update = await call_refresh(
+        refresher, provider, account, 400, {"error": "invalid_grant"}
+    )
+    assert update["new_expires_at"] is None
+    assert update["new_refresh_token"] == "old-refresh"
+
+
+async def test_invalid_client_is_retried_and_logged(
+    refresher, provider, account, caplog
+):
+    with caplog.at_level(logging.ERROR, logger="src.auth.oauth_refresh"):
+        update = await call_refresh(
+            refresher, provider, account, 401, {"error": "invalid_client"}
+        )
+    assert update is None
+    assert "client credentials" in caplog.text
+
+
+@pytest.mark.parametrize("body", [{"error": "temporarily_unavailable"}, {}])
+async def test_other_client_errors_are_retried(refresher, provider, account, body):
+    assert await call_refresh(refresher, provider, account, 400, body) is None
@@ -0,0 +1,96 @@
+import base64
+import hashlib
+
+import pytest
+
+from src.core.config import config
+from src.utils import password
+from src.utils.password import (
+    hash_password,
+    needs_rehash,
+    verify_and_rehash,
+    verify_password,
+)
+
+
+@pytest.fixture
+def pbkdf2(monkeypatch):
+    monkeypatch.setattr(config.password_hashing, "scheme", password.PBKDF2_SCHEME)
+    monkeypatch.setattr(config.password_hashing, "pbkdf2_iterations", 1000)
+
+
+@pytest.fixture
+def fast_argon2(monkeypatch):
+    monkeypatch.setattr(config.password_hashing, "scheme", "argon2id")
+    monkeypatch.setattr(config.password_hashing, "argon2_time_cost", 1)
+    monkeypatch.setattr(config.password_hashing, "argon2_memory_cost", 1024)
+    monkeypatch.setattr(password, "_argon2", None)
+    yield
+    password._argon2 = None
+
+
+def legacy_hash(plain: str, salt: str = "abcd") -> str:
+    digest = hashlib.pbkdf2_hmac(
+        "sha256", plain.encode(), salt.encode(), password.LEGACY_PBKDF2_ITERATIONS
+    )
+    return f"{salt}${base64.b64encode(digest).decode()}"
+
+
+def test_pbkdf2_hash_is_versioned(pbkdf2):
+    hashed = hash_password("secret")
+    scheme, iterations, salt, digest = hashed.split("$")
+    assert (scheme, iterations) == ("pbkdf2_sha256", "1000")
+    assert verify_password("secret", hashed)
+    assert not verify_password("wrong", hashed)
+
+
+def test_argon2_hash_round_trip(fast_argon2):
+    hashed = hash_password("secret")
+    assert hashed.startswith("$argon2id$")
+    assert verify_password("secret", hashed)
+    assert not verify_password("wrong", hashed)
+    assert not needs_rehash(hashed)
+
+
+def test_verifies_unversioned_legacy_hash(pbkdf2):
+    hashed = legacy_hash("secret")
+    assert verify_password("secret", hashed)
+    assert not verify_password("wrong", hashed)
+    assert needs_rehash(hashed)
+
+
+@pytest.mark.parametrize("stored", ["", "no-separator", "pbkdf2_sha256$x$y$z"])
+def test_malformed_hashes_do_not_verify(stored, pbkdf2):
+    assert not verify_password("secret", stored)
+
+
+def test_empty_password_is_rejected(pbkdf2):
+    with pytest.raises(ValueError):
+        hash_password("")
+
+
+def test_needs_rehash_on_changed_iterations(pbkdf2, monkeypatch):
+    hashed = hash_password("secret")
+    assert not needs_rehash(hashed)
+    monkeypatch.setattr(config.password_hashing, "pbkdf2_iterations", 2000)
+    assert needs_rehash(hashed)
+
+
+def test_needs_rehash_when_scheme_changes(pbkdf2, fast_argon2):
+    # fast_argon2 switched the scheme after pbkdf2 set it.
+    assert needs_rehash("pbkdf2_sha256$1000$salt$digest")
+
+
+def test_verify_and_rehash_upgrades_outdated_hash(pbkdf2):
+    valid, new_hash = verify_and_rehash("secret", legacy_hash("secret"))
+    assert valid
+    assert new_hash.startswith("pbkdf2_sha256$1000$")
+    assert verify_password("secret", new_hash)
+
+
+def test_verify_and_rehash_keeps_current_hash(pbkdf2):
+    assert verify_and_rehash("secret", hash_password("secret")) == (True, None)
+
+
+def test_verify_and_rehash_rejects_wrong_password(pbkdf2):
+    assert verify_and_rehash("wrong", legacy_hash("secret")) == (False, None)
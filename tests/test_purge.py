@@ -0,0 +1,74 @@
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.account import purge
+from src.account.purge import UserPurger, purge_deleted_users, purge_statements
+from src.core.config import config
+
+
+class FakeEngine:
+    """Delete ``rowcounts[table]`` rows per statement, one batch at a time."""
+
+    def __init__(self, rowcounts: dict[str, list[int]]):
+        self.rowcounts = rowcounts
+        self.executed: list[str] = []
+
+    @asynccontextmanager
+    async def begin(self):
+        yield self
+
+    async def execute(self, stmt):
+        table = stmt.table.name
+        self.executed.append(table)
+        return SimpleNamespace(rowcount=self.rowcounts[table].pop(0))
+
+
+@pytest.fixture(autouse=True)
+def no_pause(monkeypatch):
+    monkeypatch.setattr(config.app, "user_purge_pause", 0)
+
+
+def test_dependents_are_purged_before_users():
+    statements = purge_statements(100)
+    assert [stmt.table.name for stmt in statements] == [
+        "oauth_account",
+        "auth_session",
+        "user_account",
+    ]
+    for stmt in statements:
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "FOR UPDATE SKIP LOCKED" in sql
+        assert "user_account.deleted_at IS NOT NULL" in sql
+
+
+async def test_purge_repeats_full_batches(monkeypatch):
+    fake = FakeEngine(
+        {
+            "oauth_account": [2, 1],
+            "auth_session": [0],
+            "user_account": [2, 2, 0],
+        }
+    )
+    monkeypatch.setattr(purge, "engine", fake)
+
+    assert await purge_deleted_users(batch_size=2) == 4
+    assert fake.executed == [
+        "oauth_account",
+        "oauth_account",
+        "auth_session",
+        "user_account",
+        "user_account",
+        "user_account",
+    ]
+
+
+@pytest.mark.parametrize("soft_delete", [False, True])
+async def test_purger_runs_only_with_soft_delete(soft_delete, monkeypatch):
+    monkeypatch.setattr(config.app, "user_soft_delete", soft_delete)
+    purger = UserPurger()
+    await purger.start()
+    assert (purger._task is not None) == soft_delete
+    await purger.stop()
@@ -0,0 +1,232 @@
+import asyncio
+from collections import namedtuple
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from src.account import cache, services
+from src.account.schemas import UserUpdate
+from src.account.services import UserReader, UserService
+from src.core import database
+from src.core.config import config
+from src.core.database import ReplicaRouter
+from src.utils.cache import TTLCache
+
+
+def connection_error() -> OperationalError:
+    return OperationalError("SELECT 1", {}, ConnectionRefusedError())
+
+
+class Rows:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def scalar_one_or_none(self):
+        return self.rows[0] if self.rows else None
+
+    def __iter__(self):
+        return iter(self.rows)
+
+
+class StubEngine:
+    """Engine, connection and session in one; ``down`` makes every call fail."""
+
+    def __init__(self, name: str, rows=()):
+        self.name = name
+        self.rows = list(rows)
+        self.down = False
+        self.queries = []
+        self.engine = self
+
+    def _check(self) -> None:
+        if self.down:
+            raise connection_error()
+
+    async def execute(self, stmt, params=None):
+        self._check()
+        self.queries.append(params)
+        ids = (params or {}).get("ids")
+        if ids is not None:
+            return Rows([row for row in self.rows if row[0] in ids])
+        return Rows(self.rows)
+
+    def connect(self):
+        return _Connect(self)
+
+    @asynccontextmanager
+    async def session(self):
+        # Like AsyncSession, connecting is deferred to the first query.
+        yield self
+
+    async def close(self):
+        pass
+
+    async def dispose(self):
+        pass
+
+
+class _Connect:
+    def __init__(self, engine: StubEngine):
+        self.engine = engine
+
+    def __await__(self):
+        self.engine._check()
+        yield from asyncio.sleep(0).__await__()
+        return self.engine
+
+    async def __aenter__(self):
+        self.engine._check()
+        return self.engine
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+@pytest.fixture
+def primary(monkeypatch) -> StubEngine:
+    stub = StubEngine("primary")
+    monkeypatch.setattr(database, "engine", stub)
+    monkeypatch.setattr(services, "engine", stub)
+    return stub
+
+
+@pytest.fixture
+def replicas() -> list[StubEngine]:
+    return [StubEngine("replica-0"), StubEngine("replica-1")]
+
+
+@pytest.fixture
+def router(monkeypatch, replicas) -> ReplicaRouter:
+    router = ReplicaRouter([])
+    router.engines = replicas
+    router._session_factories = [replica.session for replica in replicas]
+    router._healthy = list(range(len(replicas)))
+    monkeypatch.setattr(services, "replica_router", router)
+    return router
+
+
+@pytest.fixture(autouse=True)
+def no_recent_writes(monkeypatch):
+    monkeypatch.setattr(cache, "recent_writes", TTLCache(maxsize=100, ttl=60))
+
+
+async def test_read_session_rotates_over_healthy_replicas(router):
+    names = []
+    for _ in range(3):
+        async with router.read_session() as session:
+            names.append(session.name)
+    assert names == ["replica-0", "replica-1", "replica-0"]
+
+
+async def test_read_session_drops_failing_replica(router, replicas):
+    replicas[0].down = True
+    async with router.read_session() as session:
+        await session.execute("SELECT 1")
+        pytest.fail("the connection error should leave the block")
+    assert router.status() == [
+        {"index": 0, "healthy": False},
+        {"index": 1, "healthy": True},
+    ]
+    async with router.read_session() as session:
+        assert session.name == "replica-1"
+
+
+async def test_read_session_yields_none_without_replicas(router, replicas):
+    router._healthy = []
+    async with router.read_session() as session:
+        assert session is None
+
+
+async def test_read_connection_falls_back_to_primary(router, replicas, primary):
+    for replica in replicas:
+        replica.down = True
+    async with router.read_connection() as connection:
+        assert connection is primary
+    async with router.read_connection() as connection:
+        assert connection is primary
+    assert router._healthy == []
+
+
+async def test_health_check_restores_recovered_replica(router, replicas, monkeypatch):
+    monkeypatch.setattr(config.database, "replica_health_interval", 0.01)
+    replicas[1].down = True
+    await router.start()
+    try:
+        assert router._healthy == [0]
+        replicas[1].down = False
+        async with asyncio.timeout(1):
+            while router._healthy != [0, 1]:
+                await asyncio.sleep(0.01)
+        replicas[0].down = True
+        async with asyncio.timeout(1):
+            while router._healthy != [1]:
+                await asyncio.sleep(0.01)
+    finally:
+        await router.stop()
+
+
+async def test_service_read_falls_back_to_primary_on_replica_error(
+    router, replicas, primary
+):
+    primary.rows = ["from-primary"]
+    replicas[0].down = True
+    assert await UserService(primary).get_by_id(1) == "from-primary"
+    assert router._healthy == [1]
+
+
+async def test_service_read_rechecks_primary_when_replica_has_no_row(
+    router, replicas, primary
+):
+    primary.rows = ["from-primary"]
+    assert await UserService(primary).get_by_id(1) == "from-primary"
+    assert len(replicas[0].queries) == 1
+
+
+class WritableSession(StubEngine):
+    def __init__(self, user):
+        super().__init__("primary", [user])
+
+    async def commit(self):
+        pass
+
+    async def refresh(self, user):
+        pass
+
+
+async def test_reads_after_update_skip_the_replica(router, replicas, monkeypatch):
+    user = SimpleNamespace(id=1, email="ann@example.com", username="ann")
+    session = WritableSession(user)
+    for replica in replicas:
+        replica.rows = [SimpleNamespace(id=1, email="old@example.com")]
+    monkeypatch.setattr(services.revocation_store, "revoke_user", _noop)
+
+    await UserService(session).update("1", UserUpdate(email="new@example.com"))
+    service = UserService(session)
+    assert await service.get_by_id(1) is user
+    assert await service.get_by_email("ann@example.com") is user
+    assert await service.get_by_email("new@example.com") is user
+    assert replicas[0].queries == replicas[1].queries == []
+
+
+Record = namedtuple("Record", "id email username created_at updated_at")
+
+
+async def test_record_reads_after_write_use_the_primary(replicas, primary):
+    replicas[0].rows = [
+        Record(1, "old@example.com", "ann", None, None),
+        Record(2, "b", "b", None, None),
+    ]
+    primary.rows = [Record(1, "new@example.com", "ann", None, None)]
+    cache.mark_written(1)
+
+    found = await UserReader(replicas[0]).get_records([1, 2])
+    assert found[1].email == "new@example.com"
+    assert found[2].email == "b"
+    assert replicas[0].queries == [{"ids": [2]}]
+    assert primary.queries == [{"ids": [1]}]
+
+
+async def _noop(*args):
+    pass
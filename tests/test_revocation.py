@@ -0,0 +1,121 @@
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.auth import revocation
+from src.auth.revocation import RevocationStore
+from src.core.config import config
+
+
+class FakeEngine:
+    """Record executed statements and answer selects with ``rows``."""
+
+    def __init__(self):
+        self.statements = []
+        self.rows = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        return list(self.rows)
+
+    @asynccontextmanager
+    async def begin(self):
+        yield self
+
+    connect = begin
+
+
+@pytest.fixture
+def db(monkeypatch) -> FakeEngine:
+    fake = FakeEngine()
+    monkeypatch.setattr(revocation, "engine", fake)
+    return fake
+
+
+def sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def at(seconds: float) -> datetime:
+    return datetime.fromtimestamp(time.time() + seconds, timezone.utc)
+
+
+def row(jti=None, user_id=None, issued_before=None, expires_at=None):
+    return SimpleNamespace(
+        jti=jti, user_id=user_id, issued_before=issued_before, expires_at=expires_at
+    )
+
+
+async def test_revoked_token_is_rejected_and_persisted(db):
+    store = RevocationStore()
+    await store.revoke_token("jti-1", at(60))
+
+    assert store.is_revoked("jti-1", 1, time.time())
+    assert not store.is_revoked("jti-2", 1, time.time())
+    (stmt,) = db.statements
+    assert "ON CONFLICT DO NOTHING" in sql(stmt)
+    assert stmt.compile().params["jti"] == "jti-1"
+
+
+async def test_user_epoch_rejects_tokens_issued_before_it(db):
+    store = RevocationStore()
+    await store.revoke_user(7)
+    epoch = store._users[7][0]
+
+    assert store.is_revoked(None, 7, epoch - 1)
+    assert not store.is_revoked(None, 7, epoch)
+    assert not store.is_revoked(None, 8, epoch - 1)
+    assert db.statements[0].compile().params["user_id"] == 7
+
+
+async def test_load_mirrors_table_and_keeps_latest_epoch(db):
+    store = RevocationStore()
+    db.rows = [
+        row(jti="jti-1", expires_at=at(60)),
+        row(user_id=7, issued_before=at(-10), expires_at=at(60)),
+        row(user_id=7, issued_before=at(-100), expires_at=at(60)),
+    ]
+    await store.load(since=timedelta(seconds=60))
+
+    assert store.is_revoked("jti-1", 1, time.time())
+    assert store.is_revoked(None, 7, time.time() - 20)
+    assert not store.is_revoked(None, 7, time.time())
+    assert not store._loaded
+    assert "created_at >" in sql(db.statements[0])
+
+    await store.load()
+    assert store._loaded
+    assert "created_at" not in sql(db.statements[1])
+
+
+def test_prune_drops_expired_entries(wall_clock):
+    store = RevocationStore()
+    store._tokens["short"] = time.time() + 10
+    store._tokens["long"] = time.time() + 100
+    store._remember_user(7, time.time(), time.time() + 10)
+    store._remember_user(8, time.time(), time.time() + 100)
+
+    wall_clock.advance(10)
+    store.prune()
+    assert set(store._tokens) == {"long"}
+    assert set(store._users) == {8}
+    assert len(store) == 2
+
+
+async def test_purge_deletes_expired_rows(db):
+    await RevocationStore().purge_expired()
+    (stmt,) = db.statements
+    assert sql(stmt) == (
+        "DELETE FROM revoked_token WHERE revoked_token.expires_at <= now()"
+    )
+
+
+async def test_user_epoch_lasts_as_long_as_refresh_tokens(db):
+    store = RevocationStore()
+    await store.revoke_user(7)
+    issued_before, expires = store._users[7]
+    assert expires - issued_before == config.auth.refresh_token_expire_days * 86400
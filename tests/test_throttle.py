@@ -0,0 +1,86 @@
+import ipaddress
+
+import pytest
+
+from src.auth import throttle
+from src.auth.throttle import LoginThrottle, SlidingWindowLimiter, resolve_client_ip
+
+
+def test_rejects_once_window_is_full(clock):
+    clock.now = 600.0
+    limiter = SlidingWindowLimiter(limit=3, window=60, max_keys=100)
+    assert [limiter.hit("k") for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.hit("k") == pytest.approx(60)
+    assert limiter.hit("other") == 0.0
+
+
+def test_previous_window_is_weighted_by_overlap(clock):
+    clock.now = 600.0
+    limiter = SlidingWindowLimiter(limit=4, window=60, max_keys=100)
+    for _ in range(4):
+        limiter.hit("k")
+    # Halfway into the next window half of the previous count still applies.
+    clock.advance(90)
+    assert limiter.hit("k") == 0.0
+    assert limiter.hit("k") == 0.0
+    assert limiter.hit("k") == pytest.approx(30)
+    # Two windows later the old counts are gone.
+    clock.advance(60)
+    assert limiter.hit("k") == 0.0
+
+
+def test_reset_clears_key(clock):
+    limiter = SlidingWindowLimiter(limit=1, window=60, max_keys=100)
+    limiter.hit("k")
+    assert limiter.hit("k") > 0
+    limiter.reset("k")
+    assert limiter.hit("k") == 0.0
+
+
+def test_evicts_least_recently_used_keys(clock):
+    limiter = SlidingWindowLimiter(limit=1, window=60, max_keys=2)
+    limiter.hit("a")
+    limiter.hit("b")
+    limiter.hit("c")
+    assert len(limiter) == 2
+    assert limiter.hit("a") == 0.0
+
+
+def test_login_throttle_limits_email_and_resets_on_success(clock):
+    login = LoginThrottle()
+    login.by_ip = SlidingWindowLimiter(limit=100, window=60, max_keys=100)
+    login.by_email = SlidingWindowLimiter(limit=2, window=60, max_keys=100)
+    assert login.check("1.1.1.1", "User@Example.com") is None
+    assert login.check("2.2.2.2", "user@example.com ") is None
+    assert login.check("3.3.3.3", "user@example.com") >= 1
+    login.succeeded("USER@example.com")
+    assert login.check("3.3.3.3", "user@example.com") is None
+
+
+def test_login_throttle_zero_limit_disables_dimension(clock):
+    login = LoginThrottle()
+    login.by_ip = SlidingWindowLimiter(limit=0, window=60, max_keys=100)
+    login.by_email = SlidingWindowLimiter(limit=100, window=60, max_keys=100)
+    assert all(login.check("1.1.1.1", f"{i}@example.com") is None for i in range(50))
+
+
+@pytest.fixture
+def trusted(monkeypatch):
+    monkeypatch.setattr(
+        throttle,
+        "_trusted_proxies",
+        (ipaddress.ip_network("10.0.0.0/8"),),
+    )
+
+
+def test_client_ip_ignores_forwarded_for_from_untrusted_peer(trusted):
+    assert resolve_client_ip("203.0.113.9", "198.51.100.1") == "203.0.113.9"
+
+
+def test_client_ip_takes_first_untrusted_hop_from_the_right(trusted):
+    forwarded = "198.51.100.1, 203.0.113.7, 10.0.0.2"
+    assert resolve_client_ip("10.0.0.1", forwarded) == "203.0.113.7"
+
+
+def test_client_ip_without_header_is_peer(trusted):
+    assert resolve_client_ip("10.0.0.1", None) == "10.0.0.1"
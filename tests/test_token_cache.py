@@ -0,0 +1,83 @@
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+import jwt
+import pytest
+
+from src.auth.revocation import revocation_store
+from src.auth.services import TokenService
+from src.auth.token_cache import token_cache, verified_payload
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    token_cache.clear()
+    monkeypatch.setattr(revocation_store, "_tokens", {})
+    monkeypatch.setattr(revocation_store, "_users", {})
+    yield
+    token_cache.clear()
+
+
+@pytest.fixture
+def token_service() -> TokenService:
+    return TokenService(SimpleNamespace(session=None))
+
+
+def test_verified_token_is_served_from_cache(token_service):
+    token = token_service.create_access_token(1, "ann@example.com")
+    first = token_service.verify_token(token)
+    first["sub"] = "mutated"
+
+    calls = []
+    payload = verified_payload(token, lambda: calls.append(1))
+    assert payload["sub"] == "1"
+    assert calls == []
+
+
+def test_revoked_after_caching_is_rejected(token_service):
+    token = token_service.create_access_token(1, "ann@example.com")
+    jti = token_service.verify_token(token)["jti"]
+    assert len(token_cache) == 1
+
+    revocation_store._tokens[jti] = time.time() + 60
+    with pytest.raises(ValueError, match="revoked"):
+        token_service.verify_token(token)
+
+
+def test_user_revoked_after_caching_is_rejected(token_service):
+    token = token_service.create_access_token(1, "ann@example.com")
+    issued_at = token_service.verify_token(token)["iat"]
+
+    revocation_store._users[1] = (issued_at + 1, time.time() + 60)
+    with pytest.raises(ValueError, match="revoked"):
+        token_service.verify_token(token)
+
+
+def test_entry_is_evicted_at_token_expiry(token_service, clock):
+    token = token_service.create_access_token(
+        1, "ann@example.com", expires_delta=timedelta(seconds=30)
+    )
+    token_service.verify_token(token)
+    assert len(token_cache) == 1
+
+    # jwt truncates exp to whole seconds, so the entry never outlives it.
+    clock.advance(30)
+    calls = []
+    with pytest.raises(jwt.ExpiredSignatureError):
+        verified_payload(token, lambda: calls.append(1) or expired(token))
+    assert calls == [1]
+    assert len(token_cache) == 0
+
+
+def test_expired_token_is_rejected_and_not_cached(token_service):
+    token = token_service.create_access_token(
+        1, "ann@example.com", expires_delta=timedelta(seconds=-1)
+    )
+    with pytest.raises(ValueError, match="expired"):
+        token_service.verify_token(token)
+    assert len(token_cache) == 0
+
+
+def expired(token: str):
+    raise jwt.ExpiredSignatureError(token)
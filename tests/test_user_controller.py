@@ -0,0 +1,115 @@
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from unittest.mock import Mock
+
+import pytest
+from litestar.status_codes import (
+    HTTP_200_OK,
+    HTTP_400_BAD_REQUEST,
+    HTTP_404_NOT_FOUND,
+)
+from litestar.testing import create_test_client
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.account import controller
+from src.account.controller import UserController
+from src.account.schemas import UserRecord
+from src.auth import dependencies
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def record(user_id: int) -> UserRecord:
+    return UserRecord(user_id, f"user{user_id}@example.com", f"user{user_id}", NOW, NOW)
+
+
+class FakeReader:
+    requested: list[list[int]] = []
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    async def get_records(self, user_ids):
+        FakeReader.requested.append(list(user_ids))
+        # The database returns rows in whatever order it likes.
+        return {
+            user_id: record(user_id) for user_id in sorted(user_ids) if user_id < 100
+        }
+
+
+class FakeRouter:
+    @asynccontextmanager
+    async def read_connection(self):
+        yield Mock(spec=AsyncConnection)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    FakeReader.requested = []
+    monkeypatch.setattr(controller, "UserReader", FakeReader)
+    monkeypatch.setattr(dependencies, "replica_router", FakeRouter())
+    with create_test_client(route_handlers=[UserController]) as client:
+        yield client
+
+
+def test_batch_get_keeps_request_order_and_reports_missing(client):
+    response = client.post("/users/batch-get", json={"ids": [3, 1, 404, 3, 2]})
+
+    assert response.status_code == HTTP_200_OK
+    body = response.json()
+    assert [user["id"] for user in body["users"]] == [3, 1, 2]
+    assert body["users"][0]["email"] == "user3@example.com"
+    assert body["missing"] == [404]
+    assert FakeReader.requested == [[3, 1, 404, 2]]
+
+
+def test_batch_get_rejects_empty_request(client):
+    response = client.post("/users/batch-get", json={"ids": []})
+    assert response.status_code == HTTP_400_BAD_REQUEST
+
+
+def test_batch_get_schema_describes_the_returned_body(client):
+    schema = client.get("/schema/openapi.json").json()
+    operation = schema["paths"]["/users/batch-get"]["post"]
+    body = operation["responses"]["200"]["content"]["application/json"]["schema"]
+    assert body["$ref"].endswith("/UserBatchRecord")
+    component = schema["components"]["schemas"]["UserBatchRecord"]
+    assert set(component["properties"]) == {"users", "missing"}
+
+
+class FakeLoader:
+    def __init__(self):
+        self.loaded = []
+
+    async def load(self, user_id):
+        self.loaded.append(user_id)
+        return record(user_id) if user_id < 100 else None
+
+
+def authenticated_as(user):
+    def middleware(app):
+        async def authenticate(scope, receive, send):
+            scope["user"] = user
+            await app(scope, receive, send)
+
+        return authenticate
+
+    return middleware
+
+
+@pytest.fixture
+def loader(monkeypatch) -> FakeLoader:
+    fake = FakeLoader()
+    monkeypatch.setattr(controller, "user_loader", fake)
+    return fake
+
+
+def test_get_own_user_reuses_the_authenticated_principal(loader):
+    with create_test_client(
+        route_handlers=[UserController], middleware=[authenticated_as(record(1))]
+    ) as client:
+        response = client.get("/users/1")
+        assert response.json()["email"] == "user1@example.com"
+        assert client.get("/users/2").json()["id"] == 2
+        assert client.get("/users/404").status_code == HTTP_404_NOT_FOUND
+    assert loader.loaded == [2, 404]
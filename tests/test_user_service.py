@@ -0,0 +1,141 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+
+from src.account import queries, services
+from src.account.cache import recently_written, user_cache
+from src.account.schemas import UserCreate
+from src.account.services import UserService
+from src.core.config import config
+
+
+class FakeResult:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+
+    def scalar_one_or_none(self):
+        return self.rows[0] if self.rows else None
+
+    one_or_none = scalar_one_or_none
+
+    def __iter__(self):
+        return iter(self.rows)
+
+
+class FakeSession:
+    """Answer each ``execute`` with the next queued result or exception."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    async def execute(self, stmt, params=None):
+        self.statements.append((stmt, params))
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+def sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+@pytest.fixture(autouse=True)
+def fast_hash(monkeypatch):
+    async def hash_password_async(password: str) -> str:
+        return f"hashed:{password}"
+
+    monkeypatch.setattr(services, "hash_password_async", hash_password_async)
+
+
+def new_user() -> UserCreate:
+    return UserCreate(email="ann@example.com", username="ann", password="Secret123")
+
+
+async def test_create_inserts_in_one_statement():
+    created = SimpleNamespace(id=1)
+    session = FakeSession(FakeResult([created]))
+
+    assert await UserService(session).create(new_user()) is created
+    ((stmt, _),) = session.statements
+    assert "ON CONFLICT DO NOTHING RETURNING" in sql(stmt)
+    assert stmt.compile().params["password_hash"] == "hashed:Secret123"
+    assert session.commits == 1
+
+
+@pytest.mark.parametrize(
+    ("existing", "message"),
+    [
+        (SimpleNamespace(email="ann@example.com", username="other"), "email"),
+        (SimpleNamespace(email="other@example.com", username="ann"), "username"),
+    ],
+)
+async def test_create_conflict_reports_the_taken_field(existing, message):
+    session = FakeSession(FakeResult(), FakeResult([existing]))
+
+    with pytest.raises(ValueError, match=f"User with {message} .* already exists"):
+        await UserService(session).create(new_user())
+    assert len(session.statements) == 2
+
+
+async def test_create_integrity_error_rolls_back():
+    error = IntegrityError("INSERT", {}, Exception("check violation"))
+    session = FakeSession(error)
+
+    with pytest.raises(ValueError, match="Database error"):
+        await UserService(session).create(new_user())
+    assert (session.commits, session.rollbacks) == (0, 1)
+
+
+@pytest.fixture
+def revoked_users(monkeypatch) -> list[int]:
+    revoked = []
+
+    async def revoke_user(user_id: int) -> None:
+        revoked.append(user_id)
+
+    monkeypatch.setattr(services.revocation_store, "revoke_user", revoke_user)
+    return revoked
+
+
+@pytest.mark.parametrize(
+    ("soft_delete", "stmt"),
+    [(False, queries.DELETE_USER), (True, queries.SOFT_DELETE_USER)],
+)
+async def test_delete_runs_one_statement(soft_delete, stmt, revoked_users, monkeypatch):
+    monkeypatch.setattr(config.app, "user_soft_delete", soft_delete)
+    user_cache.set(5, "cached")
+    session = FakeSession(FakeResult([(5, "eve@example.com", "eve")]))
+
+    assert await UserService(session).delete("5")
+    assert session.statements == [(stmt, {"user_id": 5})]
+    assert session.commits == 1
+    assert user_cache.get(5) is None
+    assert revoked_users == [5]
+    assert recently_written(("email", "eve@example.com"))
+
+
+def test_soft_delete_only_stamps_deleted_at():
+    assert sql(queries.SOFT_DELETE_USER).startswith(
+        "UPDATE user_account SET deleted_at=now()"
+    )
+    assert "user_account.deleted_at IS NULL" in sql(queries.SOFT_DELETE_USER)
+    assert "user_account.deleted_at IS NULL" in sql(queries.DELETE_USER)
+
+
+async def test_delete_of_missing_user_returns_false(revoked_users):
+    session = FakeSession(FakeResult())
+
+    assert not await UserService(session).delete("5")
+    assert revoked_users == []